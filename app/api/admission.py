@@ -0,0 +1,138 @@
+"""
+Admission control.
+
+``AdmissionControl`` is an ASGI middleware that caps the number of requests
+running at once per route class (auth, writes, catalog reads). Requests over
+the cap wait in a bounded FIFO queue for at most the class' queue timeout;
+when the queue is full or the wait runs out they get an immediate 503 with
+``Retry-After`` instead of piling up behind the threadpool and the database
+pool. Classes are independent, so a burst of bcrypt logins cannot starve
+catalog reads. Unclassified requests are not limited.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Collection
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.metrics import Counter, Gauge, Histogram
+
+admission_in_flight = Gauge("admission_in_flight", "Requests admitted and running", ["route_class"])
+admission_queue_depth = Gauge("admission_queue_depth", "Requests waiting for a slot", ["route_class"])
+admission_rejections = Counter(
+    "admission_rejections_total", "Requests shed by admission control", ["route_class", "reason"]
+)
+admission_wait_seconds = Histogram(
+    "admission_wait_seconds",
+    "Time requests spent queued before admission",
+    ["route_class"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+
+class RouteClass:
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        queue_limit: int,
+        queue_timeout: float,
+        prefixes: Collection[str] = (),
+        methods: Collection[str] = (),
+    ):
+        """
+        Args:
+            name: Class name, used in metrics
+            concurrency: Requests of this class allowed to run at once
+            queue_limit: Requests allowed to wait for a slot
+            queue_timeout: Seconds a request may wait before it is shed
+            prefixes: Path prefixes of the class; empty matches any path
+            methods: HTTP methods of the class; empty matches any method
+        """
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_limit = queue_limit
+        self.queue_timeout = queue_timeout
+        self.prefixes = tuple(prefixes)
+        self.methods = frozenset(methods)
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        admission_in_flight.set_function(lambda: self.active, route_class=name)
+        admission_queue_depth.set_function(lambda: len(self._waiters), route_class=name)
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.methods and method not in self.methods:
+            return False
+        return not self.prefixes or path.startswith(self.prefixes)
+
+    async def acquire(self) -> str | None:
+        """Take a slot; returns the rejection reason when the request is shed."""
+        if self.active < self.concurrency and not self._waiters:
+            self.active += 1
+            return None
+        if len(self._waiters) >= self.queue_limit:
+            return "queue_full"
+
+        started = time.perf_counter()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            return "queue_timeout"
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over as the client went away; pass it on
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            admission_wait_seconds.observe(time.perf_counter() - started, route_class=self.name)
+        return None
+
+    def release(self) -> None:
+        # Hand the slot straight to the oldest waiter so newcomers cannot overtake it
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class AdmissionControl:
+    def __init__(self, app: ASGIApp, classes: list[RouteClass]):
+        self.app = app
+        self.classes = classes
+
+    def _classify(self, scope: Scope) -> RouteClass | None:
+        for route_class in self.classes:
+            if route_class.matches(scope["method"], scope["path"]):
+                return route_class
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route_class = self._classify(scope) if scope["type"] == "http" else None
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        reason = await route_class.acquire()
+        if reason is not None:
+            admission_rejections.inc(route_class=route_class.name, reason=reason)
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "The server is busy, please retry"},
+                headers={"Retry-After": str(max(math.ceil(route_class.queue_timeout), 1))},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route_class.release()
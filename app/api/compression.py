@@ -0,0 +1,187 @@
+"""
+Negotiated response compression.
+
+``CompressionMiddleware`` picks the best encoding the client accepts among
+zstd, Brotli and gzip (the first two only when ``zstandard`` / ``brotli`` are
+installed), honouring ``q`` values and preferring them in that order on ties.
+Only complete, compressible bodies of at least ``minimum_size`` bytes are
+compressed; streamed responses and responses that already carry a
+``Content-Encoding`` are passed through.
+
+Compressed bodies are kept in a small LRU keyed by a digest of the
+uncompressed body, so a hot payload (the same book list page served over and
+over) is compressed once per encoding and level rather than on every request.
+"""
+
+import gzip
+import hashlib
+from typing import Callable
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import TTLCache
+from app.core.metrics import Counter
+
+try:
+    import zstandard
+except ImportError:  # optional, zstd is offered only when installed
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # optional, br is offered only when installed
+    brotli = None
+
+# Bodies above this are compressed on the threadpool (the codecs release the
+# GIL) and are not kept in the payload cache
+LARGE_BODY_BYTES = 256 * 1024
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/msgpack",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+compressed_responses = Counter(
+    "http_compressed_responses_total", "Responses sent compressed", ["encoding"]
+)
+compressed_bytes_saved = Counter(
+    "http_compression_bytes_saved_total", "Body bytes saved by compression", ["encoding"]
+)
+
+
+def _zstd(data: bytes, level: int) -> bytes:
+    # Compressor objects are not thread safe; building one is cheap
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def _brotli(data: bytes, level: int) -> bytes:
+    return brotli.compress(data, quality=level)
+
+
+def _gzip(data: bytes, level: int) -> bytes:
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+# In server preference order
+CODECS: dict[str, Callable[[bytes, int], bytes]] = {}
+if zstandard is not None:
+    CODECS["zstd"] = _zstd
+if brotli is not None:
+    CODECS["br"] = _brotli
+CODECS["gzip"] = _gzip
+
+
+def negotiate(accept_encoding: str, available=CODECS) -> str | None:
+    """Best available encoding for an ``Accept-Encoding`` header, or None."""
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        levels: dict[str, int],
+        route_levels: dict[str, dict[str, int]] | None = None,
+        cache_size: int = 256,
+    ):
+        """
+        Args:
+            minimum_size: Smallest body, in bytes, worth compressing
+            levels: Compression level per encoding
+            route_levels: Levels overriding ``levels`` per path prefix; the
+                          longest matching prefix wins
+            cache_size: Compressed payloads kept for reuse, 0 disables
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = levels
+        self.route_levels = sorted((route_levels or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self.cache = TTLCache("compressed_payload", maxsize=cache_size, ttl=float("inf")) if cache_size > 0 else None
+
+    def _level(self, path: str, encoding: str) -> int:
+        for prefix, levels in self.route_levels:
+            if path.startswith(prefix) and encoding in levels:
+                return levels[encoding]
+        return self.levels[encoding]
+
+    async def _compress(self, encoding: str, level: int, body: bytes) -> bytes:
+        if len(body) > LARGE_BODY_BYTES:
+            return await run_in_threadpool(CODECS[encoding], body, level)
+        if self.cache is None:
+            return CODECS[encoding](body, level)
+
+        key = (encoding, level, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = CODECS[encoding](body, level)
+            self.cache.set(key, compressed)
+        return compressed
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough or message["type"] not in ("http.response.start", "http.response.body"):
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # Held back until the body shows whether it gets compressed
+                start = message
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            content_type = headers.get("content-type", "")
+            compressible = content_type.startswith(COMPRESSIBLE_TYPES) and "content-encoding" not in headers
+            if compressible:
+                headers.add_vary_header("Accept-Encoding")
+            body = message.get("body", b"")
+            if not compressible or message.get("more_body", False) or len(body) < self.minimum_size:
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            compressed = await self._compress(encoding, self._level(scope["path"], encoding), body)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            compressed_responses.inc(encoding=encoding)
+            compressed_bytes_saved.inc(len(body) - len(compressed), encoding=encoding)
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
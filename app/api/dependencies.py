@@ -1,5 +1,6 @@
 from collections.abc import Generator
-from typing import Annotated, Type
+from dataclasses import dataclass
+from typing import Annotated, Any, Type
 
 import jwt
 from fastapi import Depends, HTTPException, status, Header
@@ -8,12 +9,16 @@ from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
 from sqlalchemy import Boolean
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core import security
 from app.core.config import settings
-from app.db.session import engine, get_db
+from app.core.token_versions import security_versions
+from app.db.session import engine, get_db, get_read_db
 from app.schema.token import TokenPayload
 from app.model.user import User
+from app.service import session_service
+from app.service.user_cache import user_cache
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -23,33 +28,15 @@ reusable_oauth2 = OAuth2PasswordBearer(
 
 SessionDep = Annotated[Session, Depends(get_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
+# Read-only catalog endpoints; an AsyncSession when DB_ASYNC_READS is enabled
+ReadSessionDep = Annotated[Session | AsyncSession, Depends(get_read_db)]
 
 
-def get_current_user(session: SessionDep, token: TokenDep) -> Type[User]:
+def decode_access_token(token: str, session: Session) -> tuple[dict[str, Any], int]:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
         )
-        try:
-            user_id = int(payload.get("sub"))
-        except (TypeError, ValueError):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Invalid user ID in token"
-            )
-
-        # Query the user
-        query = select(User).where(User.id == user_id)
-        user = session.exec(query).first()
-
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"User with id {user_id} not found"
-            )
-
-        return user
-
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -60,22 +47,81 @@ def get_current_user(session: SessionDep, token: TokenDep) -> Type[User]:
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Could not validate credentials: {str(e)}"
         )
-    except ValidationError as e:
+
+    try:
+        user_id = int(payload.get("sub"))
+    except (TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Invalid token payload structure: {str(e)}"
+            detail="Invalid user ID in token"
         )
 
+    version = payload.get("ver")
+    if version is not None and not security_versions.is_current(
+        user_id, version, lambda: session.exec(select(User.token_version).where(User.id == user_id)).first()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked"
+        )
+
+    return payload, user_id
+
+
+def get_current_user(session: SessionDep, token: TokenDep) -> Type[User]:
+    _, user_id = decode_access_token(token, session)
+
+    user = user_cache.get(user_id, token)
+    if user is not None:
+        return user
+
+    # Query the user
+    generation = user_cache.generation(user_id)
+    query = select(User).where(User.id == user_id)
+    user = session.exec(query).first()
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with id {user_id} not found"
+        )
+
+    user_cache.put(user, token, generation)
+    return user
+
 
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
-def get_current_admin(current_user: CurrentUser) -> User | None:
-    if not current_user.is_admin:
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Identity of the caller, built from token claims when available."""
+    id: int
+    email: str
+    admin: bool
+
+
+def get_current_principal(session: SessionDep, token: TokenDep) -> Principal:
+    payload, user_id = decode_access_token(token, session)
+
+    # Claims-mode tokens carry everything a principal needs; the version
+    # check in decode_access_token handles revocation.
+    if "adm" in payload and "email" in payload:
+        return Principal(id=user_id, email=payload["email"], admin=bool(payload["adm"]))
+
+    user = get_current_user(session=session, token=token)
+    return Principal(id=user.id, email=user.email, admin=user.admin)
+
+
+CurrentPrincipal = Annotated[Principal, Depends(get_current_principal)]
+
+
+def get_current_admin(principal: CurrentPrincipal) -> Principal:
+    if not principal.admin:
         raise HTTPException(
             status_code=403, detail="The user doesn't have enough privileges"
         )
-    return current_user
+    return principal
 
 def validate_refresh_token(*, authorization_header: str = Header(..., alias="Authorization"), session: SessionDep) -> int | None:
     try:
@@ -101,8 +147,8 @@ def validate_refresh_token(*, authorization_header: str = Header(..., alias="Aut
             detail="Invalid refresh token"
         )
 
-    user = session.get(User, int(user_id))
-    if not user or user.refresh_token != refresh_token:
+    user = session_service.get_session_user(session=session, refresh_token=refresh_token)
+    if not user or user.id != int(user_id):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token or user not found"
@@ -0,0 +1,32 @@
+"""
+Per-route latency budgets.
+
+``LatencyBudget`` is attached as a router dependency in ``app/api/main.py``
+next to the rate limits. It stamps the request with a deadline that the
+request's database sessions turn into statement timeouts (see
+``app.db.statement_timeout``), so a pathological filter or a deep page is
+cancelled by the database instead of holding a worker and a connection.
+"""
+
+import time
+
+from fastapi import Request
+
+
+class LatencyBudget:
+    def __init__(self, seconds: float, routes: dict[str, float] | None = None):
+        """
+        Args:
+            seconds: Budget for every route of the router, 0 disables
+            routes: Budgets overriding ``seconds`` per route path
+                    (e.g. ``{"/api/reviews/{book_id}": 1.0}``)
+        """
+        self.seconds = seconds
+        self.routes = routes or {}
+
+    async def __call__(self, request: Request) -> None:
+        route = request.scope.get("route")
+        seconds = self.routes.get(route.path, self.seconds) if route else self.seconds
+        if seconds > 0:
+            request.state.deadline = time.monotonic() + seconds
+            request.state.deadline_route = route.path if route else request.url.path
@@ -1,16 +1,27 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.api.routes import  login, private, users, utils, book, review, order, category, author
+from app.api.latency_budget import LatencyBudget
+from app.api.rate_limit import account_limit, catalog_limit, write_limit
+from app.api.routes import  login, private, users, utils, batch, book, home, review, order, category, author, admin
 from app.core.config import settings
 
+# Latency budget for catalog reads, enforced as database statement timeouts
+catalog_budget = LatencyBudget(settings.LATENCY_BUDGET_SECONDS, routes=settings.LATENCY_BUDGET_ROUTES)
+
 api_router = APIRouter()
+# Login takes the auth policy per route; the other auth routes are account calls
 api_router.include_router(login.router)
-api_router.include_router(users.router)
+api_router.include_router(users.router, dependencies=[Depends(account_limit)])
 api_router.include_router(utils.router)
-api_router.include_router(book.router)
+api_router.include_router(book.router, dependencies=[Depends(catalog_limit), Depends(catalog_budget)])
+api_router.include_router(home.router, dependencies=[Depends(catalog_limit), Depends(catalog_budget)])
 
-api_router.include_router(order.router)
-api_router.include_router(category.router)
-api_router.include_router(review.router)
+api_router.include_router(order.router, dependencies=[Depends(write_limit)])
+api_router.include_router(category.router, dependencies=[Depends(catalog_limit), Depends(catalog_budget)])
+# Creating a review also takes the write policy on the route
+api_router.include_router(review.router, dependencies=[Depends(catalog_limit), Depends(catalog_budget)])
 
-api_router.include_router(author.router)
\ No newline at end of file
+api_router.include_router(author.router, dependencies=[Depends(catalog_limit), Depends(catalog_budget)])
+api_router.include_router(admin.router)
+# Sub-requests are rate limited by the routers they target
+api_router.include_router(batch.router)
@@ -0,0 +1,29 @@
+"""
+Per-route allocation peaks.
+
+``AllocationMiddleware`` reports each request to the ``MemoryTracker`` so it
+can keep the largest allocation peak seen per route template. It does
+nothing while memory tracking is off.
+"""
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.memory import MemoryTracker
+
+
+class AllocationMiddleware:
+    def __init__(self, app: ASGIApp, tracker: MemoryTracker):
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.tracker.running:
+            await self.app(scope, receive, send)
+            return
+        token = self.tracker.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # The router stores the matched route in the (shared) scope
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            self.tracker.request_finished(token, route)
@@ -0,0 +1,81 @@
+"""
+On-demand request profiling.
+
+``ProfilingMiddleware`` profiles a request when it carries ``X-Profile: 1``
+or ``?profile=1`` and its bearer token belongs to an admin; for anyone else
+the flag is ignored. The response gets an ``X-Profile-Id`` header and the
+profile (folded stacks with SQL broken out, plus per-statement timings) can
+be downloaded from ``/admin/profiles/{id}``.
+"""
+
+from urllib.parse import parse_qs
+
+from fastapi import HTTPException
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.dependencies import get_current_principal
+from app.core.profiling import ProfileStore, RequestProfile
+from app.db import session as db_session
+
+_TRUE = ("1", "true", "yes")
+
+
+def _requested(scope: Scope, headers: Headers) -> bool:
+    if headers.get("x-profile", "").lower() in _TRUE:
+        return True
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return any(value.lower() in _TRUE for value in query.get("profile", ()))
+
+
+def _is_admin(authorization: str) -> bool:
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        with Session(db_session.engine) as session:
+            return get_current_principal(session=session, token=token).admin
+    except HTTPException:
+        return False
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp, interval: float, store: ProfileStore):
+        """
+        Args:
+            interval: Seconds between samples of a profiled request
+            store: Where finished profiles are kept for download
+        """
+        self.app = app
+        self.interval = interval
+        self.store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not _requested(scope, headers) or not await run_in_threadpool(
+            _is_admin, headers.get("authorization", "")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"], self.interval)
+        self.store.add(profile)
+        status = None
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("X-Profile-Id", profile.id)
+            await send(message)
+
+        profile.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.finish(status)
@@ -0,0 +1,68 @@
+"""
+HTTP request metrics.
+
+``RequestMetrics`` is an ASGI middleware recording per-route latency,
+request counts by status and the number of requests in flight. Routes are
+labelled by their path template (``/api/books/{book_id}``), never the raw
+path, so label cardinality stays bounded; requests that match no route share
+the ``unmatched`` label. Recording a request costs a few dictionary updates.
+
+``watch_threadpool`` exposes the saturation of the threadpool that runs sync
+endpoints and dependencies.
+"""
+
+import time
+
+from anyio import to_thread
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import Counter, Gauge, Histogram
+
+http_requests = Counter("http_requests_total", "Requests handled", ["route", "method", "status"])
+http_request_seconds = Histogram(
+    "http_request_duration_seconds", "Time to produce the full response", ["route", "method"]
+)
+http_in_flight = Gauge("http_requests_in_flight", "Requests being handled")
+threadpool_tokens = Gauge("threadpool_tokens", "Worker threads available to sync endpoints")
+threadpool_busy = Gauge("threadpool_busy", "Worker threads running sync endpoints or dependencies")
+threadpool_waiting = Gauge("threadpool_waiting", "Tasks waiting for a worker thread")
+
+
+class RequestMetrics:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_in_flight.dec()
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_request_seconds.observe(elapsed, route=path, method=method)
+            http_requests.inc(route=path, method=method, status=status)
+
+
+def watch_threadpool() -> None:
+    """Publish the running event loop's default thread limiter; call from the lifespan."""
+    limiter = to_thread.current_default_thread_limiter()
+    threadpool_tokens.set_function(lambda: limiter.total_tokens)
+    threadpool_busy.set_function(lambda: limiter.borrowed_tokens)
+    threadpool_waiting.set_function(lambda: limiter.statistics().tasks_waiting)
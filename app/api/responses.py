@@ -0,0 +1,124 @@
+"""
+Response rendering.
+
+``APIResponse`` is the application's default response class. It renders
+with orjson when installed (falling back to the standard library), encoding
+``Decimal`` as a string and dates as ISO 8601 exactly like the response
+models do. Clients that prefer ``application/msgpack`` in ``Accept`` get the
+same content as MessagePack (when ``msgpack`` is installed); the preference
+is read by ``ResponseFormatMiddleware`` and applies to every ``APIResponse``
+built while handling the request, including those routes return directly.
+"""
+
+import json
+from contextvars import ContextVar
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import orjson
+except ImportError:  # optional, the standard library encoder is used instead
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional, application/msgpack is offered only when installed
+    msgpack = None
+
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# "msgpack" while handling a request that prefers MessagePack
+response_format: ContextVar[str] = ContextVar("response_format", default="json")
+
+
+def encode_value(value: Any) -> Any:
+    """Encode what orjson/msgpack do not handle the way the response models serialize it."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def render_json(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=encode_value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=encode_value, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def load_json(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def render_msgpack(content: Any) -> bytes:
+    return msgpack.packb(content, default=encode_value)
+
+
+class APIResponse(JSONResponse):
+    def __init__(self, content: Any, status_code: int = 200, headers=None, media_type=None, background=None):
+        self.msgpack = msgpack is not None and response_format.get() == "msgpack"
+        if self.msgpack and media_type is None:
+            media_type = MSGPACK_TYPES[0]
+        super().__init__(content, status_code, headers, media_type, background)
+        if msgpack is not None:
+            self.headers.add_vary_header("Accept")
+
+    def render(self, content: Any) -> bytes:
+        if self.msgpack:
+            return render_msgpack(content)
+        return render_json(content)
+
+
+def _quality(accept: str, media_types: tuple[str, ...]) -> float:
+    best = 0.0
+    for item in accept.split(","):
+        media_type, _, params = item.partition(";")
+        if media_type.strip().lower() not in media_types:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        best = max(best, quality)
+    return best
+
+
+def prefers_msgpack(accept: str) -> bool:
+    """True when MessagePack is accepted with a higher quality than JSON."""
+    msgpack_quality = _quality(accept, MSGPACK_TYPES)
+    return msgpack_quality > 0 and msgpack_quality > _quality(accept, ("application/json",))
+
+
+class ResponseFormatMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if msgpack is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = Headers(scope=scope).get("accept", "")
+        if "msgpack" not in accept or not prefers_msgpack(accept):
+            await self.app(scope, receive, send)
+            return
+        token = response_format.set("msgpack")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            response_format.reset(token)
@@ -0,0 +1,293 @@
+"""
+Administrative Diagnostics Routes
+
+This module provides operational endpoints for the BookWorm API.
+Every endpoint requires an authenticated admin user.
+
+Endpoints:
+- GET /admin/slow-queries: List recently recorded slow SQL statements
+- DELETE /admin/slow-queries: Clear the slow query log
+- GET /admin/metrics: Snapshot of in-process counters, gauges and histograms
+- GET /admin/profiles: Recent request profiles with their SQL timings
+- GET /admin/profiles/continuous: Hottest stacks from the continuous profiler
+- DELETE /admin/profiles/continuous: Reset the continuous profiler
+- GET /admin/profiles/{profile_id}: Folded stacks of one request profile
+- GET /admin/memory: Top allocation sites, memory growth and per-route peaks
+- POST /admin/memory/start: Start tracemalloc based memory tracking
+- POST /admin/memory/snapshot: Take a memory snapshot now
+- POST /admin/memory/stop: Stop memory tracking
+
+Features:
+- Normalized SQL with bound-parameter shapes and calling service
+- Optional EXPLAIN plans captured for a sample of slow reads
+- Cache hit and miss counters
+- Flame-graph-compatible (folded stack) profiles with SQL time broken out
+- Allocation growth between snapshots to find slow memory leaks
+
+Version: 1.0.0
+"""
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.api.dependencies import get_current_admin
+from app.core.memory import memory_tracker
+from app.core.metrics import registry
+from app.core.profiling import continuous_profiler, profile_store
+from app.db.slow_query import recorder
+from app.schema.token import Message
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(get_current_admin)],
+    responses={
+        401: {"description": "Unauthorized"},
+        403: {"description": "Not enough privileges"}
+    }
+)
+
+
+@router.get(
+    "/slow-queries",
+    summary="List slow queries",
+    description="Retrieve the most recent statements slower than the configured threshold",
+    responses={
+        200: {"description": "Slow queries retrieved successfully"}
+    }
+)
+def list_slow_queries() -> dict[str, Any]:
+    """
+    Retrieve the slow query ring buffer, newest first.
+
+    Returns:
+        dict: Threshold in milliseconds and the recorded statements
+    """
+    return {
+        "threshold_ms": recorder.threshold_ms,
+        "queries": recorder.entries(),
+    }
+
+
+@router.delete(
+    "/slow-queries",
+    response_model=Message,
+    summary="Clear slow queries",
+    description="Remove all entries from the slow query log",
+    responses={
+        200: {"description": "Slow query log cleared"}
+    }
+)
+def clear_slow_queries() -> Message:
+    """
+    Clear the slow query ring buffer.
+
+    Returns:
+        Message: Success message
+    """
+    recorder.clear()
+    return Message(message="Slow query log cleared")
+
+
+@router.get(
+    "/metrics",
+    summary="Metrics snapshot",
+    description="Retrieve the current value of every registered in-process metric",
+    responses={
+        200: {"description": "Metrics retrieved successfully"}
+    }
+)
+def read_metrics() -> dict[str, Any]:
+    """
+    Retrieve a snapshot of the metrics registry.
+
+    Returns:
+        dict: Metric values keyed by metric name
+    """
+    return registry.snapshot()
+
+
+@router.get(
+    "/profiles",
+    summary="List request profiles",
+    description="Retrieve the most recent profiled requests, newest first",
+    responses={
+        200: {"description": "Profiles retrieved successfully"}
+    }
+)
+def list_profiles() -> dict[str, Any]:
+    """
+    Retrieve summaries of the stored request profiles.
+
+    Returns:
+        dict: Profile summaries with duration, sample count and SQL timings
+    """
+    return {"profiles": profile_store.summaries()}
+
+
+@router.get(
+    "/profiles/continuous",
+    response_class=PlainTextResponse,
+    summary="Continuous profile",
+    description="Download the hottest stacks across all requests as folded stacks",
+    responses={
+        200: {"description": "Folded stacks, one per line"}
+    }
+)
+def read_continuous_profile(
+    top: int | None = Query(default=None, ge=1, description="Only the N most sampled stacks")
+) -> PlainTextResponse:
+    """
+    Retrieve the stacks aggregated by the continuous profiler.
+
+    Args:
+        top: Only the N most sampled stacks
+
+    Returns:
+        PlainTextResponse: Folded stacks, ready for flamegraph.pl or speedscope
+    """
+    return PlainTextResponse(continuous_profiler.folded(top))
+
+
+@router.delete(
+    "/profiles/continuous",
+    response_model=Message,
+    summary="Reset continuous profile",
+    description="Discard the stacks aggregated by the continuous profiler",
+    responses={
+        200: {"description": "Continuous profile reset"}
+    }
+)
+def reset_continuous_profile() -> Message:
+    """
+    Reset the continuous profiler.
+
+    Returns:
+        Message: Success message
+    """
+    continuous_profiler.reset()
+    return Message(message="Continuous profile reset")
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    response_class=PlainTextResponse,
+    summary="Download request profile",
+    description="Download one request profile as folded stacks",
+    responses={
+        200: {"description": "Folded stacks, one per line"},
+        404: {"description": "Profile not found"}
+    }
+)
+def read_profile(profile_id: str) -> PlainTextResponse:
+    """
+    Retrieve one request profile.
+
+    Args:
+        profile_id: Id from the X-Profile-Id response header
+
+    Returns:
+        PlainTextResponse: Folded stacks, ready for flamegraph.pl or speedscope
+
+    Raises:
+        HTTPException: If the profile is unknown or has been evicted
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(profile.folded())
+
+
+@router.get(
+    "/memory",
+    summary="Memory report",
+    description="Retrieve the top allocation sites, growth between snapshots and per-route allocation peaks",
+    responses={
+        200: {"description": "Memory report retrieved successfully"}
+    }
+)
+def read_memory(
+    top: int | None = Query(default=None, ge=1, description="Allocation sites to list")
+) -> dict[str, Any]:
+    """
+    Retrieve the memory report; only the resident set size while tracking is off.
+
+    Args:
+        top: Allocation sites to list per section
+
+    Returns:
+        dict: Resident and traced memory, top sites, growth and route peaks
+    """
+    return memory_tracker.report(top)
+
+
+@router.post(
+    "/memory/start",
+    response_model=Message,
+    summary="Start memory tracking",
+    description="Start tracemalloc and the background snapshot sampler",
+    responses={
+        200: {"description": "Memory tracking started"}
+    }
+)
+def start_memory_tracking() -> Message:
+    """
+    Start memory tracking; allocations are slower while it runs.
+
+    Returns:
+        Message: Success message
+    """
+    memory_tracker.start()
+    return Message(message="Memory tracking started")
+
+
+@router.post(
+    "/memory/snapshot",
+    summary="Take memory snapshot",
+    description="Take a snapshot now and report the growth since the previous one",
+    responses={
+        200: {"description": "Snapshot taken"},
+        409: {"description": "Memory tracking is not running"}
+    }
+)
+def take_memory_snapshot(
+    top: int | None = Query(default=None, ge=1, description="Allocation sites to list")
+) -> dict[str, Any]:
+    """
+    Take a memory snapshot immediately.
+
+    Args:
+        top: Allocation sites to list per section
+
+    Returns:
+        dict: The memory report including the new snapshot
+
+    Raises:
+        HTTPException: If memory tracking is not running
+    """
+    if not memory_tracker.running:
+        raise HTTPException(status_code=409, detail="Memory tracking is not running")
+    memory_tracker.snapshot()
+    return memory_tracker.report(top)
+
+
+@router.post(
+    "/memory/stop",
+    response_model=Message,
+    summary="Stop memory tracking",
+    description="Stop tracemalloc and discard the snapshots",
+    responses={
+        200: {"description": "Memory tracking stopped"}
+    }
+)
+def stop_memory_tracking() -> Message:
+    """
+    Stop memory tracking.
+
+    Returns:
+        Message: Success message
+    """
+    memory_tracker.stop()
+    return Message(message="Memory tracking stopped")
@@ -18,7 +18,11 @@ from typing import List
 
 from fastapi import APIRouter
 
-from app.api.dependencies import SessionDep
+from app.api.dependencies import ReadSessionDep
+from app.api.responses import APIResponse
+from app.core.config import settings
+from app.db.session import run_read
+from app.repository import catalog_repository
 from app.model.author import Author
 from app.service import author_service
 
@@ -40,7 +44,7 @@ router = APIRouter(
         200: {"description": "Authors retrieved successfully"}
     }
 )
-def get_authors(*, session: SessionDep) -> List[Author]:
+async def get_authors(*, session: ReadSessionDep) -> List[Author]:
     """
     Retrieve all available book authors.
     
@@ -50,4 +54,10 @@ def get_authors(*, session: SessionDep) -> List[Author]:
     Returns:
         List[Author]: List of all book authors
     """
-    return author_service.get_authors(session=session)
\ No newline at end of file
+    if settings.CATALOG_CORE_READS:
+        return APIResponse(await run_read(
+            session, catalog_repository.list_authors, catalog_repository.list_authors_async
+        ))
+    return await run_read(
+        session, author_service.get_authors, author_service.get_authors_async
+    )
\ No newline at end of file
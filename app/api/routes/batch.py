@@ -0,0 +1,131 @@
+"""
+Batch Routes
+
+This module lets clients on high-latency links fetch several resources in
+one round trip.
+
+Endpoints:
+- POST /batch: Run GET sub-requests and return their responses in order
+
+Features:
+- Sub-requests run concurrently, each in its own database session
+- Each sub-request goes through the whole application, so it gets the auth,
+  rate limits, admission control and caching of the route it targets
+- At most BATCH_MAX_REQUESTS sub-requests per batch
+
+Version: 1.0.0
+"""
+
+import asyncio
+import logging
+from typing import Any
+from urllib.parse import quote, unquote
+
+from fastapi import APIRouter, Request
+from starlette.types import Message
+
+from app.api.responses import APIResponse, load_json, response_format
+from app.core.config import settings
+from app.schema.batch import BatchItem, BatchRequest, BatchResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/batch",
+    tags=["batch"],
+    responses={
+        422: {"description": "Invalid batch or too many sub-requests"},
+        500: {"description": "Internal server error"}
+    }
+)
+
+# Caller headers sub-requests act on; Accept and encodings are the batch's own
+_FORWARDED_HEADERS = frozenset((b"authorization", b"accept-language", b"user-agent", b"x-forwarded-for"))
+# Framing headers of the sub-response, meaningless inside the batch body
+_DROPPED_HEADERS = frozenset(("content-length", "content-type", "content-encoding", "vary", "traceparent"))
+
+
+async def _dispatch(request: Request, item: BatchItem) -> dict[str, Any]:
+    parent = request.scope
+    path, _, query = item.path.partition("?")
+    path = settings.API_V1_STR + unquote(path)
+    headers = [(name, value) for name, value in parent["headers"] if name in _FORWARDED_HEADERS]
+    headers.append((b"accept", b"application/json"))
+    scope = {
+        "type": "http",
+        "asgi": parent.get("asgi", {"version": "3.0"}),
+        "http_version": parent.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": parent.get("scheme", "http"),
+        "server": parent.get("server"),
+        "client": parent.get("client"),
+        "root_path": parent.get("root_path", ""),
+        "path": path,
+        "raw_path": quote(path).encode(),
+        "query_string": query.encode(),
+        "headers": headers,
+        "state": dict(parent.get("state", {})),
+    }
+
+    requested = False
+
+    async def receive() -> Message:
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        return await request.receive()
+
+    status, response_headers, body = 500, {}, []
+
+    async def send(message: Message) -> None:
+        nonlocal status, response_headers
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers = {
+                name.decode("latin-1"): value.decode("latin-1")
+                for name, value in message.get("headers", [])
+                if name.decode("latin-1") not in _DROPPED_HEADERS
+            }
+        elif message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    # A batch requested as MessagePack still reads JSON from its sub-requests
+    response_format.set("json")
+    try:
+        await request.app(scope, receive, send)
+    except Exception:
+        # The error middleware already answered 500; the other sub-requests carry on
+        logger.exception("Batch sub-request GET %s failed", item.path)
+        return {"status": 500, "headers": {}, "body": {"detail": "Internal Server Error"}}
+
+    content = b"".join(body)
+    try:
+        payload = load_json(content) if content else None
+    except ValueError:
+        payload = content.decode("utf-8", "replace")
+    return {"status": status, "headers": response_headers, "body": payload}
+
+
+@router.post(
+    "",
+    response_model=BatchResponse,
+    summary="Batch GET requests",
+    description="Run up to BATCH_MAX_REQUESTS GET requests concurrently and return their responses in order",
+    responses={
+        200: {"description": "Sub-requests ran; each result carries its own status"}
+    }
+)
+async def batch(request: Request, batch_in: BatchRequest) -> Any:
+    """
+    Run GET sub-requests against the API in one round trip.
+
+    Args:
+        request: FastAPI request object
+        batch_in: Sub-request paths, relative to the API prefix
+
+    Returns:
+        BatchResponse: Status, headers and body of every sub-request, in request order
+    """
+    results = await asyncio.gather(*(_dispatch(request, item) for item in batch_in.requests))
+    return APIResponse({"responses": results})
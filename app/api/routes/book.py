@@ -24,10 +24,15 @@ from typing import Any, Annotated, Optional, Literal
 
 from fastapi import APIRouter, Depends, Query, Request
 
-from app.api.dependencies import SessionDep
+from app.api.dependencies import ReadSessionDep
+from app.api.responses import APIResponse
+from app.core.config import settings
+from app.core.single_flight import SingleFlight, request_key
+from app.db.session import run_read, run_read_data
+from app.repository import catalog_repository
 from app.model import Book
 from app.schema.book import BookListResponse
-from app.service.book_service import get_books, get_book
+from app.service.book_service import get_books, get_book, get_books_async, get_book_async
 from app.schema.book import BookListRequest, BookInfo
 
 router = APIRouter(
@@ -41,6 +46,29 @@ router = APIRouter(
 )
 
 
+# Concurrent identical reads share one computation (and, optionally, the last result)
+book_lists = SingleFlight(
+    "book_list",
+    stale_ttl=settings.CATALOG_SINGLE_FLIGHT_STALE_SECONDS,
+    enabled=settings.CATALOG_SINGLE_FLIGHT,
+)
+book_details = SingleFlight(
+    "book_detail",
+    stale_ttl=settings.CATALOG_SINGLE_FLIGHT_STALE_SECONDS,
+    enabled=settings.CATALOG_SINGLE_FLIGHT,
+)
+
+
+async def _book_list(session, req: BookListRequest) -> APIResponse:
+    if settings.CATALOG_CORE_READS:
+        return APIResponse(await book_lists.run(request_key(req), lambda: run_read(
+            session, catalog_repository.list_books, catalog_repository.list_books_async, req=req
+        )))
+    return APIResponse(await book_lists.run(
+        request_key(req), lambda: run_read_data(session, get_books, get_books_async, req=req)
+    ))
+
+
 @router.get(
     "",
     response_model=BookListResponse,
@@ -50,8 +78,8 @@ router = APIRouter(
         200: {"description": "List of books retrieved successfully"}
     }
 )
-def list_books(
-    session : SessionDep,
+async def list_books(
+    session : ReadSessionDep,
     req : BookListRequest = Depends(BookListRequest),
 ) -> Any:
     """
@@ -74,8 +102,7 @@ def list_books(
     - sort_by: Sort by on_sale, popularity
     - sort_order: Sort in ascending (asc) or descending (desc) order
     """
-    result = get_books(session=session, req=req)
-    return result
+    return await _book_list(session, req)
 
 
 @router.get(
@@ -87,8 +114,8 @@ def list_books(
         200: {"description": "Top selling books retrieved successfully"}
     }
 )
-def top_books(
-    session : SessionDep
+async def top_books(
+    session : ReadSessionDep
 ) -> BookListResponse:
     """
     Get a list of top selling books.
@@ -104,7 +131,7 @@ def top_books(
         sort_by='on_sale',
         limit=10
     )
-    return get_books(session=session, req=req)
+    return await _book_list(session, req)
 
 
 @router.get(
@@ -116,8 +143,8 @@ def top_books(
         200: {"description": "Most reviewed books retrieved successfully"}
     }
 )
-def popular_books(
-    session : SessionDep
+async def popular_books(
+    session : ReadSessionDep
 ) -> BookListResponse:
     """
     Get a list of books with the most reviews.
@@ -133,7 +160,7 @@ def popular_books(
         sort_by='popularity',
         limit=8
     )
-    return get_books(session=session, req=req)
+    return await _book_list(session, req)
 
 
 @router.get(
@@ -145,8 +172,8 @@ def popular_books(
         200: {"description": "Recommended books retrieved successfully"}
     }
 )
-def recommend_books(
-    session : SessionDep
+async def recommend_books(
+    session : ReadSessionDep
 ) -> BookListResponse:
     """
     Get a list of recommended books.
@@ -162,7 +189,7 @@ def recommend_books(
         sort_by='recommend',
         limit=8
     )
-    return get_books(session=session, req=req)
+    return await _book_list(session, req)
 
 
 @router.get(
@@ -175,7 +202,7 @@ def recommend_books(
         404: {"description": "Book not found"}
     }
 )
-def book(session : SessionDep, book_id: int) -> BookInfo:
+async def book(session : ReadSessionDep, book_id: int) -> Any:
     """
     Get detailed information about a specific book.
     
@@ -190,5 +217,7 @@ def book(session : SessionDep, book_id: int) -> BookInfo:
     Raises:
         HTTPException: If book not found
     """
-    return get_book(session=session, book_id=book_id)
+    return APIResponse(await book_details.run(
+        book_id, lambda: run_read_data(session, get_book, get_book_async, book_id=book_id)
+    ))
 
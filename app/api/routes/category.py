@@ -18,7 +18,11 @@ from typing import List
 
 from fastapi import APIRouter
 
-from app.api.dependencies import SessionDep
+from app.api.dependencies import ReadSessionDep
+from app.api.responses import APIResponse
+from app.core.config import settings
+from app.db.session import run_read
+from app.repository import catalog_repository
 from app.model.category import Category
 from app.service import category_service
 
@@ -40,7 +44,7 @@ router = APIRouter(
         200: {"description": "Categories retrieved successfully"}
     }
 )
-def get_categories(*, session: SessionDep) -> List[Category]:
+async def get_categories(*, session: ReadSessionDep) -> List[Category]:
     """
     Retrieve all available book categories.
     
@@ -50,4 +54,10 @@ def get_categories(*, session: SessionDep) -> List[Category]:
     Returns:
         List[Category]: List of all book categories
     """
-    return category_service.get_categories(session=session)
\ No newline at end of file
+    if settings.CATALOG_CORE_READS:
+        return APIResponse(await run_read(
+            session, catalog_repository.list_categories, catalog_repository.list_categories_async
+        ))
+    return await run_read(
+        session, category_service.get_categories, category_service.get_categories_async
+    )
\ No newline at end of file
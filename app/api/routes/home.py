@@ -0,0 +1,91 @@
+"""
+Homepage Routes
+
+This module serves the data behind the BookWorm homepage in one request.
+
+Endpoints:
+- GET /home: On sale, recommended and popular book lists
+
+Features:
+- Per-book prices and ratings computed once for all three lists
+- Lists identical to /books/top-sale, /books/recommend and /books/most_reviews
+- Cacheable as a unit: shared in process, Cache-Control and ETag for clients
+
+Version: 1.0.0
+"""
+
+import datetime
+import hashlib
+from typing import Any
+
+from fastapi import APIRouter, Request, Response, status
+
+from app.api.dependencies import ReadSessionDep
+from app.api.responses import APIResponse, render_json
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.single_flight import SingleFlight
+from app.db.session import run_read, run_read_data
+from app.repository import catalog_repository
+from app.schema.book import HomeResponse
+from app.service.book_service import get_home, get_home_async
+
+router = APIRouter(
+    prefix="/home",
+    tags=["home"],
+    responses={
+        500: {"description": "Internal server error"}
+    }
+)
+
+home_flight = SingleFlight(
+    "home",
+    stale_ttl=settings.CATALOG_SINGLE_FLIGHT_STALE_SECONDS,
+    enabled=settings.CATALOG_SINGLE_FLIGHT,
+)
+# Rendered content and its ETag, per day (discounts start and end by date)
+_home_cache = TTLCache("home", maxsize=2, ttl=settings.HOME_CACHE_SECONDS)
+
+
+async def _compute_home(session) -> tuple[Any, str]:
+    if settings.CATALOG_CORE_READS:
+        content = await run_read(session, catalog_repository.home, catalog_repository.home_async)
+    else:
+        content = await run_read_data(session, get_home, get_home_async)
+    # Weak: the JSON and MessagePack renderings carry the same content
+    etag = f'W/"{hashlib.blake2b(render_json(content), digest_size=16).hexdigest()}"'
+    return content, etag
+
+
+@router.get(
+    "",
+    response_model=HomeResponse,
+    summary="Homepage lists",
+    description="Get the on sale, recommended and popular book lists of the homepage in one response",
+    responses={
+        200: {"description": "Homepage lists retrieved successfully"},
+        304: {"description": "Lists unchanged since the ETag in If-None-Match"}
+    }
+)
+async def home(request: Request, session: ReadSessionDep) -> Any:
+    """
+    Get the featured book lists of the homepage.
+
+    Args:
+        request: FastAPI request object
+        session: Database session
+
+    Returns:
+        HomeResponse: On sale (10), recommended (8) and popular (8) books
+    """
+    key = datetime.date.today()
+    cached = _home_cache.get(key)
+    if cached is None:
+        cached = await home_flight.run(key, lambda: _compute_home(session))
+        _home_cache.set(key, cached)
+    content, etag = cached
+
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={int(settings.HOME_CACHE_SECONDS)}"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return APIResponse(content, headers=headers)
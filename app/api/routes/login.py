@@ -23,10 +23,11 @@ Version: 1.0.0
 
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, Response, Cookie, status
+from fastapi import APIRouter, Depends, Response, Cookie, Header, status
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.api.dependencies import CurrentUser, SessionDep
+from app.api.rate_limit import account_limit, auth_limit
 from app.core.config import settings
 from app.schema.token import Token
 from app.schema.user import UserPublic
@@ -45,6 +46,7 @@ router = APIRouter(
 
 @router.post(
     "/token",
+    dependencies=[Depends(auth_limit)],
     response_model=Token,
     summary="Login and get access token",
     description="Authenticate user and return access token with refresh token in cookie",
@@ -53,10 +55,11 @@ router = APIRouter(
         400: {"description": "Invalid credentials"}
     }
 )
-def login_access_token(
+async def login_access_token(
     response: Response,
     session: SessionDep,
-    form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    user_agent: Annotated[str | None, Header()] = None
 ) -> Token:
     """
     OAuth2 compatible token login, get an access token for future requests.
@@ -65,6 +68,7 @@ def login_access_token(
         response: FastAPI response object for setting cookies
         session: Database session
         form_data: OAuth2 password request form containing username (email) and password
+        user_agent: Client User-Agent, recorded as the session's device
         
     Returns:
         Token: Access token for API authentication
@@ -72,16 +76,18 @@ def login_access_token(
     Raises:
         HTTPException: If credentials are invalid
     """
-    return auth_service.login_user(
+    return await auth_service.login_user(
         response=response,
         session=session,
         email=form_data.username,
-        password=form_data.password
+        password=form_data.password,
+        device=user_agent
     )
 
 
 @router.post(
     "/token/test",
+    dependencies=[Depends(account_limit)],
     response_model=UserPublic,
     summary="Test token validity",
     description="Test if the current access token is valid and return user data",
@@ -105,6 +111,7 @@ def test_token(current_user: CurrentUser) -> Any:
 
 @router.get(
     "/token/refresh",
+    dependencies=[Depends(account_limit)],
     response_model=Token,
     summary="Refresh access token",
     description="Get a new access token using refresh token from cookie",
@@ -141,6 +148,7 @@ def refresh_token(
 
 @router.post(
     "/logout",
+    dependencies=[Depends(account_limit)],
     summary="Logout user",
     description="Clear refresh token and logout user",
     responses={
@@ -0,0 +1,53 @@
+"""
+Metrics Routes
+
+This module exposes the in-process metrics registry to Prometheus.
+It is mounted at the application root, outside the API prefix.
+
+Endpoints:
+- GET /metrics: All registered metrics in the Prometheus text format
+
+Features:
+- Request latency, in-flight requests and threadpool saturation
+- Database pool checkouts, waits and timeouts
+- Cache hits, misses, sizes and hit ratios
+- Optional bearer token (METRICS_TOKEN) for scrapers
+
+Version: 1.0.0
+"""
+
+import secrets
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.metrics import render_prometheus
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _check_token(authorization: str | None) -> None:
+    if not settings.METRICS_TOKEN:
+        return
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token, settings.METRICS_TOKEN):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+
+
+@router.get(
+    "/metrics",
+    include_in_schema=False,
+    response_class=PlainTextResponse,
+)
+def metrics(authorization: str | None = Header(default=None)) -> PlainTextResponse:
+    """
+    Render the metrics registry for a Prometheus scrape.
+
+    Returns:
+        PlainTextResponse: Metrics in the text exposition format
+    """
+    _check_token(authorization)
+    return PlainTextResponse(render_prometheus(), media_type=CONTENT_TYPE)
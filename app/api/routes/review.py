@@ -22,9 +22,15 @@ from typing import Optional, Literal
 from fastapi import APIRouter, Depends, Query, HTTPException
 
 from app.api.dependencies import get_current_user
-from app.api.dependencies import SessionDep
+from app.api.dependencies import SessionDep, ReadSessionDep
+from app.api.rate_limit import write_limit
+from app.api.responses import APIResponse
+from app.core.config import settings
+from app.core.single_flight import SingleFlight, request_key
+from app.db.session import run_read, run_read_data
+from app.repository import catalog_repository
 from app.schema.review import ReviewResponse, ReviewRequest, ReviewCreateRequest
-from app.service.review_service import get_reviews_for_book, create_review
+from app.service.review_service import get_reviews_for_book, get_reviews_for_book_async, create_review
 from app.model.review import BaseReview
 import app.service.review_service as review_service
 
@@ -38,6 +44,13 @@ router = APIRouter(
     }
 )
 
+# Concurrent identical review pages share one computation
+review_lists = SingleFlight(
+    "review_list",
+    stale_ttl=settings.CATALOG_SINGLE_FLIGHT_STALE_SECONDS,
+    enabled=settings.CATALOG_SINGLE_FLIGHT,
+)
+
 @router.get(
     "/{book_id}",
     response_model=ReviewResponse,
@@ -48,10 +61,10 @@ router = APIRouter(
         422: {"description": "Invalid parameters"}
     }
 )
-def get_book_reviews(*,
+async def get_book_reviews(*,
     book_id: int,
     req : ReviewRequest = Depends(ReviewRequest),
-    session: SessionDep
+    session: ReadSessionDep
 ) -> ReviewResponse:
     """
     Retrieve reviews for a specific book with pagination.
@@ -67,13 +80,22 @@ def get_book_reviews(*,
     Raises:
         HTTPException: If book not found or parameters invalid
     """
+    key = request_key(book_id, req)
     try:
-        return get_reviews_for_book(session=session, book_id=book_id, req=req)
+        if settings.CATALOG_CORE_READS:
+            return APIResponse(await review_lists.run(key, lambda: run_read(
+                session, catalog_repository.list_reviews, catalog_repository.list_reviews_async,
+                book_id=book_id, req=req
+            )))
+        return APIResponse(await review_lists.run(key, lambda: run_read_data(
+            session, get_reviews_for_book, get_reviews_for_book_async, book_id=book_id, req=req
+        )))
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
 
 @router.post(
     "/{book_id}",
+    dependencies=[Depends(write_limit)],
     response_model=BaseReview,
     summary="Create review",
     description="Create a new review for a specific book",
@@ -30,6 +30,7 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import col, delete, func, select
+from starlette.concurrency import run_in_threadpool
 
 
 from app.schema.token import Message
@@ -104,7 +105,7 @@ def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
         400: {"description": "User with this email already exists"}
     }
 )
-def create_user(*, session: SessionDep, user_in: UserCreate) -> Any:
+async def create_user(*, session: SessionDep, user_in: UserCreate) -> Any:
     """
     Create a new user in the system.
     
@@ -118,14 +119,14 @@ def create_user(*, session: SessionDep, user_in: UserCreate) -> Any:
     Raises:
         HTTPException: If user with email already exists
     """
-    user = user_service.get_user_by_email(session=session, email=user_in.email)
+    user = await run_in_threadpool(user_service.get_user_by_email, session=session, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system.",
         )
 
-    user = user_service.create_user(session=session, user_create=user_in)
+    user = await user_service.create_user_async(session=session, user_create=user_in)
     return user
 
 
@@ -167,6 +168,8 @@ def update_user_me(
     session.add(current_user)
     session.commit()
     session.refresh(current_user)
+    # Only the email is signed into claims-mode tokens
+    user_service.invalidate_user(current_user.id, session=session, revoke_tokens="email" in user_data)
     return current_user
 
 
@@ -207,6 +210,7 @@ def update_password_me(
     current_user.hashed_password = hashed_password
     session.add(current_user)
     session.commit()
+    user_service.invalidate_user(current_user.id, session=session)
     return Message(message="Password updated successfully")
 
 
@@ -262,6 +266,7 @@ def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
         )
     session.delete(current_user)
     session.commit()
+    user_service.invalidate_user(current_user.id, session=session)
     return Message(message="User deleted successfully")
 
 
@@ -275,7 +280,7 @@ def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
         400: {"description": "User with this email already exists"}
     }
 )
-def register_user(session: SessionDep, user_in: UserRegister) -> Any:
+async def register_user(session: SessionDep, user_in: UserRegister) -> Any:
     """
     Register a new user without requiring authentication.
     
@@ -289,14 +294,14 @@ def register_user(session: SessionDep, user_in: UserRegister) -> Any:
     Raises:
         HTTPException: If user with email already exists
     """
-    user = user_service.get_user_by_email(session=session, email=user_in.email)
+    user = await run_in_threadpool(user_service.get_user_by_email, session=session, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system",
         )
     user_create = UserCreate.model_validate(user_in)
-    user = user_service.create_user(session=session, user_create=user_create)
+    user = await user_service.create_user_async(session=session, user_create=user_create)
     return user
 
 
@@ -425,4 +430,5 @@ def delete_user(
         )
     session.delete(user)
     session.commit()
+    user_service.invalidate_user(user.id, session=session)
     return Message(message="User deleted successfully")
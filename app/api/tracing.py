@@ -0,0 +1,60 @@
+"""
+Route spans.
+
+``TracingMiddleware`` opens the root span of every sampled request, named
+after the matched route template (``GET /api/books/{book_id}``), and makes
+it the parent of the service, repository and SQL spans the request creates.
+An incoming W3C ``traceparent`` continues the caller's trace; its sampling
+decision is honoured from trusted upstreams only. Requests dispatched in
+process (``POST /batch`` sub-requests) nest under the span already open.
+Sampled responses return their own ``traceparent``.
+"""
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.trace_context import activate, current_span, deactivate
+from app.core.tracing import Tracer
+
+
+class TracingMiddleware:
+    def __init__(self, app: ASGIApp, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        parent = current_span()
+        if parent is not None:
+            span = self.tracer.start_span(scope["path"], "server", parent)
+        else:
+            client = scope.get("client")
+            span = self.tracer.start_trace(
+                scope["path"], "server", Headers(scope=scope).get("traceparent"), client[0] if client else None
+            )
+        if span is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_trace(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                span.attributes["http.status_code"] = message["status"]
+                MutableHeaders(scope=message).append("traceparent", f"00-{span.trace_id}-{span.span_id}-01")
+            await send(message)
+
+        token = activate(span)
+        try:
+            await self.app(scope, receive, send_with_trace)
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            deactivate(token)
+            # The router stores the matched route in the (shared) scope
+            route = getattr(scope.get("route"), "path", None)
+            span.name = f"{scope['method']} {route or scope['path']}"
+            span.attributes["http.method"] = scope["method"]
+            span.attributes["http.route"] = route or "unmatched"
+            self.tracer.end_span(span)
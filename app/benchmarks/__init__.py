@@ -0,0 +1,6 @@
+"""
+Standalone performance benchmarks.
+
+Each module is runnable with ``python -m app.benchmarks.<name>`` from the
+repository root and prints its results as a plain table.
+"""
@@ -0,0 +1,60 @@
+"""
+Cost of building book listing statements per request versus per shape.
+
+For every sort order, times what happens in-process before a listing query
+reaches the driver: building the page and count statements from scratch and
+generating their SQLAlchemy cache keys (what get_books used to do; compilation
+itself is served from SQLAlchemy's compiled cache either way), against
+fetching them from the query-shape cache and generating the keys. Needs no
+database.
+
+Usage:
+    python -m app.benchmarks.book_list_statements --iterations 2000
+"""
+
+import argparse
+import time
+
+from app.schema.book import BookListRequest
+from app.service.book_service import (
+    _book_list_statements,
+    _build_books_query,
+    _count_query,
+    _statement_cache,
+)
+
+
+def time_per_call(function, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    sort_orders = ["on_sale", "popularity", "price_asc", "price_desc", "recommend"]
+    print(f"{'sort_by':>12} {'rebuild µs':>12} {'cached µs':>12}")
+    for sort_by in sort_orders:
+        req = BookListRequest(sort_by=sort_by, category_name="Fiction")
+
+        def rebuild() -> None:
+            query = _build_books_query(req)
+            query.offset(0).limit(req.items_per_page)._generate_cache_key()
+            _count_query(query)._generate_cache_key()
+
+        def cached() -> None:
+            for statement in _book_list_statements(req):
+                statement._generate_cache_key()
+
+        _statement_cache.clear()
+        rebuild_us = time_per_call(rebuild, args.iterations)
+        cached_us = time_per_call(cached, args.iterations)
+        print(f"{sort_by:>12} {rebuild_us:>12.1f} {cached_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+ORM versus Core read path for the catalog listings.
+
+Seeds a temporary SQLite database, then serves each listing both ways and
+reports CPU time and peak memory allocated per request: the ORM path (service
+function, response model validation and JSON serialization the way FastAPI
+does it) against the Core path (catalog_repository rows mapped to dicts and
+dumped directly).
+
+Usage:
+    python -m app.benchmarks.catalog_read_path --books 2000 --iterations 200
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, List
+
+from pydantic import TypeAdapter
+from sqlmodel import Session, SQLModel
+
+from app.benchmarks.plan_check import seed
+from app.db.engine import create_db_engine
+from app.model import Author, Category
+from app.repository import catalog_repository
+from app.schema.book import BookListRequest, BookListResponse
+from app.schema.review import ReviewRequest, ReviewResponse
+from app.service import author_service, book_service, category_service, review_service
+
+
+def _dumps(content: Any) -> bytes:
+    # Same settings as starlette's JSONResponse
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def orm_response(adapter: TypeAdapter, produce: Callable[[], Any]) -> Callable[[], bytes]:
+    def run() -> bytes:
+        value = adapter.validate_python(produce(), from_attributes=True)
+        return _dumps(adapter.dump_python(value, mode="json"))
+    return run
+
+
+def core_response(produce: Callable[[], Any]) -> Callable[[], bytes]:
+    return lambda: _dumps(produce())
+
+
+def measure(run: Callable[[], bytes], iterations: int) -> tuple[float, float]:
+    """Return CPU ms and peak traced KiB per call."""
+    run()  # warm statement and compiled caches
+    started = time.process_time()
+    for _ in range(iterations):
+        run()
+    cpu_ms = (time.process_time() - started) / iterations * 1000
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    run()
+    peak_kib = (tracemalloc.get_traced_memory()[1] - baseline) / 1024
+    tracemalloc.stop()
+    return cpu_ms, peak_kib
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--books", type=int, default=2000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "catalog.db")
+    engine = create_db_engine(f"sqlite:///{path}", name="benchmark")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        seed(session, args.books)
+
+    books_req = BookListRequest(sort_by="popularity", items_per_page=25)
+    reviews_req = ReviewRequest(items_per_page=25)
+    with Session(engine) as session:
+        cases = {
+            "books (25 items)": (
+                orm_response(TypeAdapter(BookListResponse), lambda: book_service.get_books(session=session, req=books_req)),
+                core_response(lambda: catalog_repository.list_books(session=session, req=books_req)),
+            ),
+            "reviews (25 items)": (
+                orm_response(TypeAdapter(ReviewResponse), lambda: review_service.get_reviews_for_book(session, 1, reviews_req)),
+                core_response(lambda: catalog_repository.list_reviews(session=session, book_id=1, req=reviews_req)),
+            ),
+            "authors": (
+                orm_response(TypeAdapter(List[Author]), lambda: author_service.get_authors(session=session)),
+                core_response(lambda: catalog_repository.list_authors(session=session)),
+            ),
+            "categories": (
+                orm_response(TypeAdapter(List[Category]), lambda: category_service.get_categories(session=session)),
+                core_response(lambda: catalog_repository.list_categories(session=session)),
+            ),
+        }
+
+        print(f"{'listing':<20} {'path':<5} {'cpu ms':>8} {'peak KiB':>9}")
+        for name, (orm, core) in cases.items():
+            for label, run in (("orm", orm), ("core", core)):
+                cpu_ms, peak_kib = measure(run, args.iterations)
+                print(f"{name:<20} {label:<5} {cpu_ms:>8.2f} {peak_kib:>9.1f}")
+                session.expunge_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Login throughput against the password hashing pool size.
+
+Simulates a login storm: ``--requests`` password verifications are awaited
+concurrently on one event loop, the way the async login handler issues them.
+Inline hashing (pool size 0) runs on Starlette's threadpool (40 threads);
+otherwise requests queue for the process pool without holding a thread.
+
+Usage:
+    python -m app.benchmarks.login_throughput --sizes 0 1 2 4 --requests 200
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core.hashing import HashingPoolBusy, PasswordHasher, get_context
+
+
+async def run(pool_size: int, requests: int, rounds: int, queue_limit: int) -> tuple[float, int]:
+    hasher = PasswordHasher(
+        rounds=rounds, pool_size=pool_size, queue_limit=queue_limit, queue_timeout=5.0
+    )
+    stored = get_context(rounds).hash("correct horse battery")
+    # Warm the worker processes so start-up is not measured.
+    await hasher.verify_and_update_async("correct horse battery", stored)
+
+    async def login() -> bool:
+        try:
+            return (await hasher.verify_and_update_async("correct horse battery", stored))[0]
+        except HashingPoolBusy:
+            return False
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    hasher.shutdown()
+    return requests / elapsed, results.count(False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--queue-limit", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"{'pool size':>10} {'logins/s':>10} {'rejected':>10}")
+    for size in args.sizes:
+        throughput, rejected = asyncio.run(run(size, args.requests, args.rounds, args.queue_limit))
+        label = "inline" if size == 0 else str(size)
+        print(f"{label:>10} {throughput:>10.1f} {rejected:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Allocation budgets for response building.
+
+Seeds a temporary SQLite database and, for each catalog endpoint, builds the
+complete response body the way a request does (a fresh session, the service
+or repository call, response model validation and rendering) under
+tracemalloc. Reports the peak bytes allocated per build and the bytes still
+retained after ``--iterations`` further builds, which should stay near zero.
+Exits with status 1 when a peak exceeds its budget or retained memory
+exceeds ``--max-retained-kib``, so regressions in response building (larger
+identity maps, extra copies of ``BookInfo`` lists) are caught in CI.
+
+Usage:
+    python -m app.benchmarks.memory_budget --books 2000 --iterations 50
+    python -m app.benchmarks.memory_budget --budget "GET /books (orm)=4096"
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+from typing import Any, Callable, List
+
+from pydantic import TypeAdapter
+from sqlmodel import Session, SQLModel
+
+from app.api.responses import APIResponse
+from app.benchmarks.plan_check import seed
+from app.db.engine import create_db_engine
+from app.model import Author
+from app.repository import catalog_repository
+from app.schema.book import BookInfo, BookListRequest, BookListResponse
+from app.schema.review import ReviewRequest, ReviewResponse
+from app.service import author_service, book_service, review_service
+
+# Peak KiB allocated while building one response, measured with --books 2000
+# and 25 items per page, with headroom for interpreter and library variance
+BUDGETS_KIB = {
+    "GET /books (orm)": 384,
+    "GET /books (core)": 160,
+    "GET /books/{id}": 160,
+    "GET /reviews/{id} (orm)": 192,
+    "GET /reviews/{id} (core)": 128,
+    "GET /authors": 320,
+}
+
+
+def builders(engine) -> dict[str, Callable[[], bytes]]:
+    render = APIResponse(None).render
+
+    def validated(adapter: TypeAdapter, value: Any) -> Any:
+        # What FastAPI does with a response_model route's return value
+        return adapter.dump_python(adapter.validate_python(value, from_attributes=True), mode="json")
+
+    books_req = BookListRequest(sort_by="popularity", items_per_page=25)
+    reviews_req = ReviewRequest(items_per_page=25)
+    book_list, book_info = TypeAdapter(BookListResponse), TypeAdapter(BookInfo)
+    review_list, authors = TypeAdapter(ReviewResponse), TypeAdapter(List[Author])
+
+    def build(produce: Callable[[Session], Any]) -> Callable[[], bytes]:
+        def run() -> bytes:
+            with Session(engine) as session:
+                return render(produce(session))
+        return run
+
+    return {
+        "GET /books (orm)": build(lambda s: validated(book_list, book_service.get_books(session=s, req=books_req))),
+        "GET /books (core)": build(lambda s: catalog_repository.list_books(session=s, req=books_req)),
+        "GET /books/{id}": build(lambda s: validated(book_info, book_service.get_book(session=s, book_id=1))),
+        "GET /reviews/{id} (orm)": build(
+            lambda s: validated(review_list, review_service.get_reviews_for_book(s, 1, reviews_req))
+        ),
+        "GET /reviews/{id} (core)": build(
+            lambda s: catalog_repository.list_reviews(session=s, book_id=1, req=reviews_req)
+        ),
+        "GET /authors": build(lambda s: validated(authors, author_service.get_authors(session=s))),
+    }
+
+
+def measure(build: Callable[[], bytes], iterations: int) -> tuple[int, int]:
+    """Return peak bytes of one build and bytes retained over ``iterations`` builds."""
+    # Warm up statement caches and lazily built state first
+    build()
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    build()
+    peak = tracemalloc.get_traced_memory()[1] - before
+
+    for _ in range(iterations):
+        build()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    return peak, retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--books", type=int, default=2000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--max-retained-kib", type=float, default=64.0, help="budget for memory kept across builds")
+    parser.add_argument(
+        "--budget", action="append", default=[], metavar="ENDPOINT=KIB", help="override an endpoint's peak budget"
+    )
+    args = parser.parse_args()
+
+    budgets = dict(BUDGETS_KIB)
+    for item in args.budget:
+        endpoint, _, kib = item.rpartition("=")
+        budgets[endpoint] = float(kib)
+
+    path = os.path.join(tempfile.mkdtemp(), "memory.db")
+    engine = create_db_engine(f"sqlite:///{path}", name="benchmark")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        seed(session, args.books)
+
+    tracemalloc.start()
+    failed = False
+    print(f"{'endpoint':<26} {'peak KiB':>9} {'budget':>8} {'retained KiB':>13}")
+    for name, build in builders(engine).items():
+        peak, retained = measure(build, args.iterations)
+        peak_kib, retained_kib = peak / 1024, retained / 1024
+        over = peak_kib > budgets[name] or retained_kib > args.max_retained_kib
+        failed |= over
+        print(f"{name:<26} {peak_kib:>9.1f} {budgets[name]:>8.0f} {retained_kib:>13.1f}{'  over budget' if over else ''}")
+    tracemalloc.stop()
+
+    if failed:
+        print("memory budget exceeded")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Query plan regression check for the hot service queries.
+
+Runs each hot service function against a seeded database, captures the
+SELECTs it issues and EXPLAINs them. The check fails (exit status 1) if any
+of them reads one of the indexed tables (discount, review, order_item, order)
+with a sequential scan. On Postgres sequential scans are disabled for the
+EXPLAIN so that a small dataset cannot hide a missing index; any Seq Scan
+left on a checked table means no usable index exists. On SQLite a ``SCAN``
+of a checked table that is not ``USING ... INDEX`` counts as a failure.
+
+Listing queries legitimately scan ``book``; only the tables above are checked.
+
+Usage:
+    python -m app.benchmarks.plan_check --url sqlite:////tmp/plan.db --seed 2000
+    python -m app.benchmarks.plan_check            # configured, already seeded database
+"""
+
+import argparse
+import datetime
+import random
+import re
+import sys
+from decimal import Decimal
+from typing import Any, Callable
+
+from fastapi import HTTPException
+from sqlalchemy import event, func, insert
+from sqlmodel import Session, SQLModel, select
+
+from app.db.engine import create_db_engine
+from app.model import Author, Book, Category, Discount, Order, OrderItem, Review, User
+from app.schema.book import BookListRequest
+from app.schema.review import ReviewRequest
+from app.service import book_service, order_service, review_service
+
+CHECKED_TABLES = {"discount", "review", "order_item", "orderitem", "order"}
+
+_SQLITE_SCAN = re.compile(r"\bSCAN (\w+)(?: AS (\w+))?")
+_ALIAS_SUFFIX = re.compile(r"_\d+$")
+
+
+def seed(session: Session, books: int) -> None:
+    """Insert a synthetic catalog with reviews, discounts and orders."""
+    if session.exec(select(func.count()).select_from(Book)).one():
+        sys.exit("Refusing to seed: the database already has books")
+
+    rng = random.Random(7)
+    today = datetime.date.today()
+    authors = max(books // 20, 1)
+    categories = 10
+    users = max(books // 10, 1)
+
+    session.exec(insert(Author), params=[{"author_name": f"Author {i}"} for i in range(authors)])
+    session.exec(insert(Category), params=[{"category_name": f"Category {i}"} for i in range(categories)])
+    session.exec(insert(User), params=[
+        {"email": f"user{i}@example.com", "password": "x", "admin": False} for i in range(users)
+    ])
+    session.exec(insert(Book), params=[{
+        "author_id": i % authors + 1,
+        "category_id": i % categories + 1,
+        "book_title": f"Book {i}",
+        "book_price": Decimal(rng.randint(500, 9900)) / 100,
+    } for i in range(books)])
+    session.exec(insert(Discount), params=[{
+        "book_id": book_id,
+        "discount_start_date": today - datetime.timedelta(days=rng.randint(0, 30)),
+        "discount_end_date": today + datetime.timedelta(days=rng.randint(-10, 30)),
+        "discount_price": Decimal(rng.randint(100, 490)) / 100,
+    } for book_id in range(1, books + 1) for _ in range(rng.randint(0, 3))])
+    session.exec(insert(Review), params=[{
+        "book_id": book_id,
+        "review_title": "Review",
+        "rating_start": rng.randint(1, 5),
+        "review_date": datetime.datetime.now() - datetime.timedelta(days=rng.randint(0, 900)),
+    } for book_id in range(1, books + 1) for _ in range(rng.randint(0, 20))])
+    session.exec(insert(Order), params=[{
+        "user_id": i % users + 1,
+        "order_amount": Decimal("10.00"),
+        "order_date": datetime.datetime.now() - datetime.timedelta(days=rng.randint(0, 900)),
+    } for i in range(books * 2)])
+    session.exec(insert(OrderItem), params=[{
+        "order_id": order_id,
+        "book_id": rng.randint(1, books),
+        "quantity": 1,
+        "price": Decimal("10.00"),
+    } for order_id in range(1, books * 2 + 1) for _ in range(rng.randint(1, 3))])
+    session.commit()
+
+
+def hot_queries() -> dict[str, Callable[[Session], Any]]:
+    def ignore_http_errors(function: Callable[[], Any]) -> None:
+        try:
+            function()
+        except HTTPException:
+            pass
+
+    queries: dict[str, Callable[[Session], Any]] = {}
+    for sort_by in ("on_sale", "popularity", "price_asc", "price_desc", "recommend"):
+        req = BookListRequest(sort_by=sort_by)
+        queries[f"get_books[{sort_by}]"] = lambda s, req=req: book_service.get_books(session=s, req=req)
+    queries["get_books[filters]"] = lambda s: book_service.get_books(
+        session=s, req=BookListRequest(category_name="Category 1", author_name="Author 1", min_rating=3)
+    )
+    queries["get_book"] = lambda s: ignore_http_errors(lambda: book_service.get_book(session=s, book_id=1))
+    queries["get_reviews_for_book"] = lambda s: review_service.get_reviews_for_book(
+        s, 1, ReviewRequest(sort_by="newest")
+    )
+    queries["get_reviews_for_book[star]"] = lambda s: review_service.get_reviews_for_book(
+        s, 1, ReviewRequest(star=5, sort_by="oldest")
+    )
+    queries["check_purchase_eligibility"] = lambda s: ignore_http_errors(
+        lambda: review_service._check_purchase_eligibility(s, book_id=1, user_id=1)
+    )
+    queries["order_prices"] = lambda s: order_service._query_books_with_prices(
+        s, [1, 2, 3], datetime.date.today()
+    )
+    return queries
+
+
+def capture_statements(engine, run: Callable[[Session], Any]) -> list[tuple[str, Any]]:
+    captured: list[tuple[str, Any]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        with Session(engine) as session:
+            run(session)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def _postgres_seq_scans(plan: dict) -> set[str]:
+    found = set()
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in CHECKED_TABLES:
+        found.add(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found |= _postgres_seq_scans(child)
+    return found
+
+
+def _sqlite_seq_scans(rows: list) -> set[str]:
+    found = set()
+    for row in rows:
+        detail = str(row[-1])
+        match = _SQLITE_SCAN.search(detail)
+        if match is None or "USING" in detail:
+            continue
+        table = _ALIAS_SUFFIX.sub("", match.group(1))
+        if table in CHECKED_TABLES:
+            found.add(table)
+    return found
+
+
+def sequential_scans(engine, statement: str, parameters: Any) -> set[str]:
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if engine.dialect.name == "postgresql":
+            cursor.execute("SET enable_seqscan = off")
+            cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+            return _postgres_seq_scans(cursor.fetchone()[0][0]["Plan"])
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        return _sqlite_seq_scans(cursor.fetchall())
+    finally:
+        raw.rollback()
+        raw.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=None, help="database URL (defaults to the configured one)")
+    parser.add_argument("--seed", type=int, default=0, help="create tables and seed this many books first")
+    args = parser.parse_args()
+
+    engine = create_db_engine(args.url, name="plan_check")
+    if engine.dialect.name not in ("postgresql", "sqlite"):
+        sys.exit(f"Unsupported dialect: {engine.dialect.name}")
+    if args.seed:
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            seed(session, args.seed)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+    failures = 0
+    print(f"{'query':<32} {'statements':>10}  result")
+    for name, run in hot_queries().items():
+        statements = capture_statements(engine, run)
+        scanned = set()
+        for statement, parameters in statements:
+            scanned |= sequential_scans(engine, statement, parameters)
+        if scanned:
+            failures += 1
+            result = "SEQ SCAN on " + ", ".join(sorted(scanned))
+        else:
+            result = "ok"
+        print(f"{name:<32} {len(statements):>10}  {result}")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
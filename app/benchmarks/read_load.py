@@ -0,0 +1,80 @@
+"""
+Read endpoint load against a running API.
+
+Fires ``--requests`` GETs at each path with ``--concurrency`` requests in
+flight and reports throughput and latency percentiles. Run it once against a
+server started with ``DB_ASYNC_READS=false`` and once with ``true`` to compare
+the threadpool and asyncio read paths under the same load.
+
+Usage:
+    python -m app.benchmarks.read_load --url http://localhost:8000 --concurrency 50 100 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/api/books?page=1&limit=20&sort_by=on_sale",
+    "/api/books/top-sale",
+    "/api/books/recommend",
+    "/api/books/1",
+    "/api/reviews/1?sort_by=newest",
+    "/api/categories",
+]
+
+
+async def run(url: str, path: str, requests: int, concurrency: int) -> tuple[float, list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        await client.get(path)  # warm-up
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return requests / elapsed, latencies, errors
+
+
+def percentile(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100)[q - 1] * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--paths", nargs="+", default=DEFAULT_PATHS)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'path':<45} {'conc':>5} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for path in args.paths:
+        for concurrency in args.concurrency:
+            throughput, latencies, errors = await run(args.url, path, args.requests, concurrency)
+            print(
+                f"{path[:45]:<45} {concurrency:>5} {throughput:>9.1f} "
+                f"{percentile(latencies, 50):>8.1f} {percentile(latencies, 95):>8.1f} "
+                f"{percentile(latencies, 99):>8.1f} {errors:>7}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
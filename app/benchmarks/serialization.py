@@ -0,0 +1,94 @@
+"""
+Response serialization time per endpoint.
+
+Seeds a temporary SQLite database, builds each endpoint's response content
+once (the JSON-ready data FastAPI hands to the response class) and reports
+the time to render it with starlette's ``JSONResponse`` (stdlib json), with
+``APIResponse`` (orjson) and as MessagePack, plus the body sizes. Renderers
+whose package is not installed are skipped.
+
+Usage:
+    python -m app.benchmarks.serialization --books 2000 --iterations 2000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Callable, List
+
+from pydantic import TypeAdapter
+from sqlmodel import Session, SQLModel
+from starlette.responses import JSONResponse
+
+from app.api import responses
+from app.benchmarks.plan_check import seed
+from app.db.engine import create_db_engine
+from app.model import Author
+from app.repository import catalog_repository
+from app.schema.book import BookInfo, BookListRequest, BookListResponse
+from app.schema.review import ReviewRequest, ReviewResponse
+from app.service import author_service, book_service, review_service
+
+
+def renderers() -> dict[str, Callable[[Any], bytes]]:
+    stdlib = JSONResponse(None)
+    result = {"json": stdlib.render}
+    if responses.orjson is not None:
+        result["orjson"] = responses.render_json
+    if responses.msgpack is not None:
+        result["msgpack"] = responses.render_msgpack
+    return result
+
+
+def measure(render: Callable[[Any], bytes], content: Any, iterations: int) -> float:
+    """Return microseconds per render."""
+    render(content)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        render(content)
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--books", type=int, default=2000)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "serialization.db")
+    engine = create_db_engine(f"sqlite:///{path}", name="benchmark")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        seed(session, args.books)
+
+    def as_json(adapter: TypeAdapter, value: Any) -> Any:
+        # What FastAPI passes to the response class for a response_model route
+        return adapter.dump_python(adapter.validate_python(value, from_attributes=True), mode="json")
+
+    books_req = BookListRequest(sort_by="popularity", items_per_page=25)
+    reviews_req = ReviewRequest(items_per_page=25)
+    with Session(engine) as session:
+        contents = {
+            "GET /books (orm)": as_json(
+                TypeAdapter(BookListResponse), book_service.get_books(session=session, req=books_req)
+            ),
+            "GET /books (core)": catalog_repository.list_books(session=session, req=books_req),
+            "GET /books/{id}": as_json(TypeAdapter(BookInfo), book_service.get_book(session=session, book_id=1)),
+            "GET /reviews/{id} (orm)": as_json(
+                TypeAdapter(ReviewResponse), review_service.get_reviews_for_book(session, 1, reviews_req)
+            ),
+            "GET /reviews/{id} (core)": catalog_repository.list_reviews(session=session, book_id=1, req=reviews_req),
+            "GET /authors": as_json(TypeAdapter(List[Author]), author_service.get_authors(session=session)),
+        }
+
+    available = renderers()
+    print(f"{'endpoint':<26} {'renderer':<8} {'us/render':>10} {'bytes':>8}")
+    for name, content in contents.items():
+        for label, render in available.items():
+            micros = measure(render, content, args.iterations)
+            print(f"{name:<26} {label:<8} {micros:>10.1f} {len(render(content)):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Cold start time and memory budget.
+
+Starts fresh interpreters that import ``app.main`` and build the application
+with ``create_app()``, and reports the median wall time (interpreter start
+included) and the peak RSS after startup. Exits with status 1 when either
+exceeds its budget, so it can gate CI. ``--profile`` also prints the modules
+that take the longest to import, from ``python -X importtime``.
+
+Usage:
+    python -m app.benchmarks.startup --runs 5 --max-seconds 2.5 --max-rss-mib 200
+    python -m app.benchmarks.startup --profile 25
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+_STARTUP = """
+import json, resource
+import app.main
+app.main.create_app()
+print(json.dumps({"rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+"""
+
+
+def start_once() -> tuple[float, float]:
+    """Return wall seconds and peak RSS in MiB of one cold start."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", _STARTUP], capture_output=True, text=True, check=True
+    )
+    seconds = time.perf_counter() - started
+    rss_kib = json.loads(result.stdout.strip().splitlines()[-1])["rss_kib"]
+    return seconds, rss_kib / 1024
+
+
+def import_profile(top: int) -> list[tuple[float, float, str]]:
+    """Slowest imports as (cumulative ms, self ms, module)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main; app.main.create_app()"],
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us) / 1000, int(self_us) / 1000, module.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=2.5, help="budget for the median cold start")
+    parser.add_argument("--max-rss-mib", type=float, default=200.0, help="budget for peak RSS after startup")
+    parser.add_argument("--profile", type=int, default=0, metavar="N", help="print the N slowest imports")
+    args = parser.parse_args()
+
+    if args.profile:
+        print(f"{'cumulative ms':>13} {'self ms':>8}  module")
+        for cumulative_ms, self_ms, module in import_profile(args.profile):
+            print(f"{cumulative_ms:>13.1f} {self_ms:>8.1f}  {module}")
+        print()
+
+    samples = [start_once() for _ in range(args.runs)]
+    seconds = statistics.median(sample[0] for sample in samples)
+    rss_mib = max(sample[1] for sample in samples)
+    print(f"cold start  median {seconds:.3f}s  (budget {args.max_seconds:.3f}s)")
+    print(f"peak RSS    {rss_mib:.1f} MiB  (budget {args.max_rss_mib:.1f} MiB)")
+
+    if seconds > args.max_seconds or rss_mib > args.max_rss_mib:
+        print("startup budget exceeded")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
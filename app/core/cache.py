@@ -0,0 +1,74 @@
+"""
+Bounded in-process caches.
+
+``TTLCache`` is a thread-safe LRU map whose entries also expire after a fixed
+time to live. Hits and misses are reported to the metrics registry under the
+cache name so every cache in the process shows up in the same place.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from app.core.metrics import Counter, Gauge
+from app.core.trace_context import annotate
+
+cache_hits = Counter("cache_hits_total", "Cache lookups answered from memory", ["cache"])
+cache_misses = Counter("cache_misses_total", "Cache lookups that fell through", ["cache"])
+cache_entries = Gauge("cache_entries", "Entries currently held", ["cache"])
+cache_hit_ratio = Gauge("cache_hit_ratio", "Share of lookups answered from memory since start", ["cache"])
+
+_MISSING = object()
+
+
+def _hit_ratio(name: str) -> float:
+    hits = cache_hits.value(cache=name)
+    lookups = hits + cache_misses.value(cache=name)
+    return hits / lookups if lookups else 0.0
+
+
+class TTLCache:
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        cache_entries.set_function(self.__len__, cache=name)
+        cache_hit_ratio.set_function(lambda: _hit_ratio(name), cache=name)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is not _MISSING:
+                expires_at, value = item
+                if expires_at > now:
+                    self._data.move_to_end(key)
+                    cache_hits.inc(cache=self.name)
+                    annotate(f"cache.{self.name}.hit", True)
+                    return value
+                del self._data[key]
+        cache_misses.inc(cache=self.name)
+        annotate(f"cache.{self.name}.hit", False)
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
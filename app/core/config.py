@@ -35,6 +35,12 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "123456"
 
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    # Sign admin flag, email and security version into access tokens so that
+    # principal and admin checks need no database read. Workers re-read a
+    # user's security version at most every TOKEN_VERSION_CACHE_SECONDS, which
+    # bounds how long a token revoked on another worker is still accepted.
+    ACCESS_TOKEN_EMBED_CLAIMS: bool = False
+    TOKEN_VERSION_CACHE_SECONDS: float = 30.0
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60
     FRONTEND_HOST: str = "http://localhost:5173"
 
@@ -59,9 +65,51 @@ class Settings(BaseSettings):
     POSTGRES_PORT: int = os.getenv("POSTGRES_PORT")
     POSTGRES_DB: str = os.getenv("POSTGRES_DB")
 
+    # Full database URL; overrides the POSTGRES_* parts when set
+    DATABASE_URL: str | None = None
+
+    # Connection pool shared by every module through app.db.session.engine
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 500
+    # psycopg prepares a statement server side after this many executions on a
+    # connection; negative disables it (e.g. behind pgbouncer transaction pooling)
+    DB_PREPARE_THRESHOLD: int = 5
+    DB_ECHO: bool = False
+    # Serve catalog reads (books, reviews, authors, categories) through the
+    # asyncio engine instead of sync sessions on the threadpool
+    DB_ASYNC_READS: bool = False
+    # Serve catalog listings (books, reviews, authors, categories) from Core
+    # rows mapped straight to JSON, skipping ORM hydration and response
+    # model validation
+    CATALOG_CORE_READS: bool = True
+    # Coalesce identical concurrent catalog reads (book lists, book details,
+    # reviews) into one computation. With a stale window, callers arriving
+    # while a key is being recomputed get its previous result at once.
+    CATALOG_SINGLE_FLIGHT: bool = True
+    CATALOG_SINGLE_FLIGHT_STALE_SECONDS: float = 0.0
+    # GET /home: seconds the featured lists are reused in process and may be
+    # cached by clients and proxies; 0 computes them on every request
+    HOME_CACHE_SECONDS: float = 60.0
+    # POST /batch: GET sub-requests allowed per batch
+    BATCH_MAX_REQUESTS: int = 10
+    # Read replicas for catalog reads (comma separated URLs). Empty sends all
+    # reads to the primary. A replica that fails to connect is skipped for
+    # DB_REPLICA_RETRY_SECONDS; a client that wrote keeps reading from the
+    # primary for DB_REPLICA_STICKY_SECONDS.
+    DB_REPLICA_URLS: Annotated[list[str] | str, BeforeValidator(parse_cors)] = []
+    DB_REPLICA_RETRY_SECONDS: float = 30.0
+    DB_REPLICA_STICKY_SECONDS: float = 5.0
+    DB_REPLICA_STICKY_KEYS: int = 100_000
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
         return str(MultiHostUrl.build(
             scheme="postgresql+psycopg",
             username=self.POSTGRES_USER,
@@ -88,6 +136,119 @@ class Settings(BaseSettings):
     REFRESH_COOKIE_PATH: str = "/"
     REFRESH_COOKIE_DOMAIN: str | None = None  # Set if needed for cross-subdomain access
 
+    # bcrypt work factor and the process pool that runs hashing off the
+    # request threadpool (pool size 0 hashes inline)
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_POOL_SIZE: int = 2
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 2.0
+
+    # Refresh sessions: revocation cache size and expired-row sweeper
+    REFRESH_REVOCATION_CACHE_SIZE: int = 10_000
+    REFRESH_SESSION_SWEEP_INTERVAL_SECONDS: float = 300.0
+    REFRESH_SESSION_SWEEP_BATCH_SIZE: int = 500
+
+    # Rate limiting; policies are attached per router in app/api/main.py.
+    # Set a redis:// URL to share counters between workers.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND_URL: str | None = None
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+
+    # Response compression: zstd, br (when their packages are installed) or
+    # gzip, as negotiated with Accept-Encoding. Bodies smaller than
+    # COMPRESSION_MINIMUM_SIZE bytes are sent as is. COMPRESSION_ROUTE_LEVELS
+    # overrides the levels per path prefix; COMPRESSION_CACHE_SIZE compressed
+    # payloads are kept so hot pages are compressed once.
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_LEVELS: dict[str, int] = {"zstd": 3, "br": 4, "gzip": 6}
+    COMPRESSION_ROUTE_LEVELS: dict[str, dict[str, int]] = {
+        "/api/books": {"zstd": 9, "br": 6, "gzip": 9},
+        "/api/reviews": {"zstd": 9, "br": 6, "gzip": 9},
+    }
+    COMPRESSION_CACHE_SIZE: int = 256
+
+    # Admission control: per route class (auth, writes, catalog reads) at most
+    # *_CONCURRENCY requests run at once, *_QUEUE wait for a slot and a request
+    # that waited *_QUEUE_SECONDS is shed with 503
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_AUTH_CONCURRENCY: int = 4
+    ADMISSION_AUTH_QUEUE: int = 32
+    ADMISSION_AUTH_QUEUE_SECONDS: float = 2.0
+    ADMISSION_WRITE_CONCURRENCY: int = 16
+    ADMISSION_WRITE_QUEUE: int = 64
+    ADMISSION_WRITE_QUEUE_SECONDS: float = 1.0
+    ADMISSION_CATALOG_CONCURRENCY: int = 32
+    ADMISSION_CATALOG_QUEUE: int = 256
+    ADMISSION_CATALOG_QUEUE_SECONDS: float = 0.5
+    # Batches only wait on their sub-requests, which are admitted as catalog
+    # (or other) requests of their own
+    ADMISSION_BATCH_CONCURRENCY: int = 16
+    ADMISSION_BATCH_QUEUE: int = 64
+    ADMISSION_BATCH_QUEUE_SECONDS: float = 0.5
+
+    # Authenticated user cache used by get_current_user. Each worker keeps its
+    # own; a changed or deleted user may be served from another worker's cache
+    # for up to USER_CACHE_TTL_SECONDS
+    USER_CACHE_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: float = 60.0
+
+    # Latency budget (seconds) for catalog requests, passed to the database as
+    # a statement timeout; over budget answers 504 (or 503 when the budget was
+    # spent before the query started). LATENCY_BUDGET_ROUTES overrides it per
+    # route path, e.g. {"/api/books": 3}. 0 disables.
+    LATENCY_BUDGET_SECONDS: float = 2.0
+    LATENCY_BUDGET_ROUTES: dict[str, float] = {}
+
+    # tracemalloc based allocation tracking, reported on /admin/memory; it
+    # slows allocations down, so it is off unless enabled here or started
+    # from the admin endpoint. Allocations are attributed to the innermost
+    # application frame of a MEMORY_TRACKING_FRAMES deep traceback, which has
+    # to reach past SQLAlchemy and pydantic internals into app/
+    MEMORY_TRACKING_ENABLED: bool = False
+    MEMORY_TRACKING_FRAMES: int = 25
+    MEMORY_SNAPSHOT_INTERVAL_SECONDS: float = 300.0
+    MEMORY_TOP_SITES: int = 25
+
+    # Prometheus /metrics endpoint; set a token to require
+    # "Authorization: Bearer <token>" from the scraper
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: str | None = None
+
+    # Admins can profile a single request with "X-Profile: 1" or
+    # "?profile=1"; profiles are kept for download from /admin/profiles.
+    # The continuous profiler samples all busy threads at a low rate for
+    # the life of the process, 0 disables it.
+    PROFILING_ENABLED: bool = True
+    PROFILING_SAMPLE_INTERVAL_SECONDS: float = 0.005
+    PROFILING_STORE_SIZE: int = 20
+    PROFILING_CONTINUOUS_INTERVAL_SECONDS: float = 0.1
+    PROFILING_CONTINUOUS_MAX_STACKS: int = 5000
+
+    # Request tracing: spans per route, service call and SQL statement.
+    # TRACING_EXPORTER is "none", "file" (JSON lines at TRACING_FILE_PATH),
+    # "otlp" (OTLP/HTTP JSON to TRACING_OTLP_ENDPOINT) or "module:Class".
+    # TRACING_SAMPLE_RATE is the share of requests traced. The sampled flag of
+    # an incoming traceparent header is only honoured from the addresses or
+    # networks in TRACING_TRUSTED_UPSTREAMS (comma separated, e.g. the
+    # gateway); other callers keep their trace id but are sampled at the rate.
+    TRACING_EXPORTER: str = "none"
+    TRACING_SAMPLE_RATE: float = 0.01
+    TRACING_TRUSTED_UPSTREAMS: Annotated[list[str] | str, BeforeValidator(parse_cors)] = []
+    TRACING_QUEUE_SIZE: int = 2048
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+
+    # Error reporting; sentry_sdk is only imported when a DSN is set
+    SENTRY_DSN: str | None = None
+    SENTRY_TRACES_SAMPLE_RATE: float = 0.0
+
+    # Slow query log, served on /admin/slow-queries
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_LOG_SIZE: int = 200
+    SLOW_QUERY_EXPLAIN: bool = False
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1
+
     def _check_default_secret(self, var_name: str, value: str | None) -> None:
         if value == "heheheha":
             message = (
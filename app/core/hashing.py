@@ -0,0 +1,155 @@
+"""
+Password hashing pool.
+
+bcrypt is deliberately slow, so hashing and verification run in a dedicated
+process pool instead of the request threadpool. Submissions are bounded: at
+most ``PASSWORD_HASH_POOL_SIZE + PASSWORD_HASH_QUEUE_LIMIT`` operations may be
+queued or running, and callers that cannot get a slot within
+``PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS`` get ``HashingPoolBusy`` so the API can
+shed the request instead of piling up threads.
+
+Request handlers use the ``*_async`` methods: they wait for a slot and for
+the worker process on the event loop, so a login storm queues in front of
+the process pool without holding threadpool workers. The blocking methods
+are for scripts and the few synchronous callers left.
+"""
+
+import asyncio
+import threading
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable
+
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, Histogram
+
+# passlib and multiprocessing are imported on first use: they are slow to
+# import and only the auth routes need them
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+    from passlib.context import CryptContext
+
+
+class HashingPoolBusy(Exception):
+    """Raised when the hashing queue is full for longer than the wait budget."""
+
+
+@lru_cache(maxsize=4)
+def get_context(rounds: int) -> "CryptContext":
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+# Worker entry points; module level so they can be pickled for the pool.
+
+def _hash(password: str, rounds: int) -> str:
+    return get_context(rounds).hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str, rounds: int) -> tuple[bool, str | None]:
+    return get_context(rounds).verify_and_update(password, hashed_password)
+
+
+hash_queue_depth = Gauge(
+    "password_hash_queue_depth", "Hashing operations queued or running in the pool"
+)
+hash_rejections = Counter(
+    "password_hash_rejections_total", "Hashing operations rejected because the pool was saturated"
+)
+hash_wait_seconds = Histogram(
+    "password_hash_wait_seconds", "Time spent waiting for a free hashing slot"
+)
+
+
+class PasswordHasher:
+    def __init__(self, rounds: int, pool_size: int, queue_limit: int, queue_timeout: float):
+        self.rounds = rounds
+        self.pool_size = pool_size
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max(pool_size, 1) + queue_limit)
+        # Created on first use so it binds to the server's event loop
+        self._async_slots: asyncio.Semaphore | None = None
+        self._async_limit = max(pool_size, 1) + queue_limit
+        self._executor: "ProcessPoolExecutor | None" = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self) -> "ProcessPoolExecutor":
+        if self._executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            with self._executor_lock:
+                if self._executor is None:
+                    # spawn: forking a threaded server process is not safe
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.pool_size,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._executor
+
+    def _run(self, function: Callable[..., Any], *args: Any) -> Any:
+        if self.pool_size <= 0:
+            return function(*args)
+
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            hash_rejections.inc()
+            raise HashingPoolBusy("Password hashing pool is saturated")
+        hash_wait_seconds.observe(time.perf_counter() - started)
+        hash_queue_depth.inc()
+        try:
+            return self._get_executor().submit(function, *args).result()
+        finally:
+            hash_queue_depth.dec()
+            self._slots.release()
+
+    async def _run_async(self, function: Callable[..., Any], *args: Any) -> Any:
+        if self.pool_size <= 0:
+            from starlette.concurrency import run_in_threadpool
+
+            return await run_in_threadpool(function, *args)
+
+        if self._async_slots is None:
+            self._async_slots = asyncio.Semaphore(self._async_limit)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._async_slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            hash_rejections.inc()
+            raise HashingPoolBusy("Password hashing pool is saturated") from None
+        hash_wait_seconds.observe(time.perf_counter() - started)
+        hash_queue_depth.inc()
+        try:
+            return await asyncio.wrap_future(self._get_executor().submit(function, *args))
+        finally:
+            hash_queue_depth.dec()
+            self._async_slots.release()
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password, self.rounds)
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async(_hash, password, self.rounds)
+
+    def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """Verify ``password``; also return a new hash if the stored one uses
+        outdated parameters (e.g. fewer rounds than configured)."""
+        return self._run(_verify_and_update, password, hashed_password, self.rounds)
+
+    async def verify_and_update_async(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        return await self._run_async(_verify_and_update, password, hashed_password, self.rounds)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.PASSWORD_HASH_ROUNDS,
+    pool_size=settings.PASSWORD_HASH_POOL_SIZE,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS,
+)
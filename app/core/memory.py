@@ -0,0 +1,204 @@
+"""
+Allocation and memory growth tracking.
+
+``MemoryTracker`` runs tracemalloc and a background thread that takes a
+snapshot every ``interval`` seconds. Reports list the top allocation sites,
+the growth since the previous snapshot and since the first one (the slow,
+steady kind that shows up as RSS creeping over days), and the peak bytes
+allocated per route.
+
+Sites are the innermost frame under ``app/`` of each allocation's traceback,
+so memory allocated inside SQLAlchemy or pydantic on behalf of, say, a
+repository function is reported at that function's line.
+
+Per-route peaks come from the process-wide tracemalloc peak, so they are
+only recorded for requests that ran alone: a request that overlapped
+another one is not counted rather than counted wrong. tracemalloc slows
+allocations down noticeably, so tracking is opt-in: at startup with
+MEMORY_TRACKING_ENABLED, or at runtime from the admin endpoints. The resident
+set size gauge is always available.
+"""
+
+import linecache
+import os
+import threading
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any
+
+from app.core.config import settings
+from app.core.metrics import Gauge
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Allocations made by tracemalloc itself and by imports are noise here
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def resident_bytes() -> int:
+    """Current resident set size of the process, 0 where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+process_resident = Gauge("process_resident_memory_bytes", "Resident set size of the process")
+process_resident.set_function(resident_bytes)
+traced_bytes = Gauge("memory_traced_bytes", "Bytes currently allocated, as seen by tracemalloc")
+request_peak_bytes = Gauge(
+    "memory_request_peak_bytes", "Largest allocation peak of a single request", ["route"]
+)
+
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+
+
+def _site(traceback: tracemalloc.Traceback) -> str:
+    """Innermost application frame of ``traceback``, else its innermost frame."""
+    # Tracebacks are ordered from the oldest frame to the most recent
+    for frame in reversed(traceback):
+        if frame.filename.startswith(_APP_DIR):
+            return f"{frame.filename}:{frame.lineno}"
+    frame = traceback[-1]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+def _top_sites(snapshot: tracemalloc.Snapshot, top: int) -> list[dict[str, Any]]:
+    sites: dict[str, list[int]] = {}
+    for statistic in snapshot.statistics("traceback"):
+        totals = sites.setdefault(_site(statistic.traceback), [0, 0])
+        totals[0] += statistic.size
+        totals[1] += statistic.count
+    ranked = sorted(sites.items(), key=lambda item: -item[1][0])[:top]
+    return [{"site": site, "size_bytes": size, "count": count} for site, (size, count) in ranked]
+
+
+class MemoryTracker:
+    def __init__(self, frames: int, interval: float, top: int):
+        """
+        Args:
+            frames: Stack frames tracemalloc keeps per allocation
+            interval: Seconds between background snapshots
+            top: Allocation sites listed in reports
+        """
+        self.frames = frames
+        self.interval = interval
+        self.top = top
+        self._baseline: tracemalloc.Snapshot | None = None
+        self._previous: tracemalloc.Snapshot | None = None
+        self._latest: tracemalloc.Snapshot | None = None
+        self._latest_at: str | None = None
+        self._route_peaks: dict[str, int] = {}
+        self._in_flight = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        traced_bytes.set_function(lambda: tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0)
+
+    @property
+    def running(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self.snapshot()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="memory-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+        tracemalloc.stop()
+        with self._lock:
+            self._baseline = self._previous = self._latest = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.snapshot()
+
+    def snapshot(self) -> None:
+        """Take a snapshot now; the first one becomes the growth baseline."""
+        snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        with self._lock:
+            if self._baseline is None:
+                self._baseline = snapshot
+            self._previous, self._latest = self._latest, snapshot
+            self._latest_at = datetime.now(timezone.utc).isoformat()
+
+    def request_started(self) -> tuple[int, int] | None:
+        """Begin measuring a request; returns the token for ``request_finished``."""
+        with self._lock:
+            self._in_flight += 1
+            self._generation += 1
+            if self._in_flight > 1:
+                return None
+            tracemalloc.reset_peak()
+            return self._generation, tracemalloc.get_traced_memory()[0]
+
+    def request_finished(self, token: tuple[int, int] | None, route: str) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            # Any request that started meanwhile moved the generation on
+            if token is None or token[0] != self._generation:
+                return
+            peak = tracemalloc.get_traced_memory()[1] - token[1]
+            if peak > self._route_peaks.get(route, 0):
+                self._route_peaks[route] = peak
+                request_peak_bytes.set(peak, route=route)
+
+    def _growth(self, snapshot: tracemalloc.Snapshot | None, since: tracemalloc.Snapshot | None, top: int) -> list[dict[str, Any]]:
+        if snapshot is None or since is None or snapshot is since:
+            return []
+        sites: dict[str, list[int]] = {}
+        for diff in snapshot.compare_to(since, "traceback"):
+            totals = sites.setdefault(_site(diff.traceback), [0, 0, 0])
+            totals[0] += diff.size_diff
+            totals[1] += diff.count_diff
+            totals[2] += diff.size
+        ranked = sorted(sites.items(), key=lambda item: -item[1][0])[:top]
+        return [
+            {"site": site, "size_diff_bytes": size_diff, "count_diff": count_diff, "size_bytes": size}
+            for site, (size_diff, count_diff, size) in ranked
+            if size_diff > 0
+        ]
+
+    def report(self, top: int | None = None) -> dict[str, Any]:
+        top = top or self.top
+        result: dict[str, Any] = {"tracing": self.running, "resident_bytes": resident_bytes()}
+        if not self.running:
+            return result
+        with self._lock:
+            baseline, previous, latest = self._baseline, self._previous, self._latest
+            result["snapshot_at"] = self._latest_at
+            result["route_peaks_bytes"] = dict(sorted(self._route_peaks.items(), key=lambda item: -item[1]))
+        current, peak = tracemalloc.get_traced_memory()
+        result["traced_bytes"] = current
+        result["traced_peak_bytes"] = peak
+        result["tracemalloc_overhead_bytes"] = tracemalloc.get_tracemalloc_memory()
+        if latest is not None:
+            result["top_sites"] = _top_sites(latest, top)
+        result["growth_since_previous"] = self._growth(latest, previous, top)
+        result["growth_since_start"] = self._growth(latest, baseline, top)
+        return result
+
+
+memory_tracker = MemoryTracker(
+    frames=settings.MEMORY_TRACKING_FRAMES,
+    interval=settings.MEMORY_SNAPSHOT_INTERVAL_SECONDS,
+    top=settings.MEMORY_TOP_SITES,
+)
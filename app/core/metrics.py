@@ -0,0 +1,188 @@
+"""
+In-process metric primitives.
+
+Counters, gauges and histograms keep their samples in plain dictionaries keyed
+by label values, so recording a sample is a dict lookup and an addition. Every
+metric registers itself with the module level ``registry`` which can produce
+a JSON friendly snapshot for the admin endpoints, or the Prometheus text
+exposition format for ``/metrics`` (``render_prometheus``).
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Iterable
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, "Metric"] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: "Metric") -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> "Metric | None":
+        return self._metrics.get(name)
+
+    def collect(self) -> list["Metric"]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def snapshot(self) -> dict[str, Any]:
+        return {metric.name: metric.snapshot() for metric in self.collect()}
+
+
+registry = MetricsRegistry()
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def _key(self, labels: dict[str, Any]) -> tuple:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> list[tuple[dict[str, str], Any]]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(dict(zip(self.labelnames, key)), value) for key, value in items]
+
+    def snapshot(self) -> Any:
+        samples = self.samples()
+        if not self.labelnames:
+            return samples[0][1] if samples else 0
+        return [{"labels": labels, "value": value} for labels, value in samples]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._functions: dict[tuple, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float], **labels: Any) -> None:
+        """Read the value from ``function`` whenever the gauge is collected."""
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = function
+
+    def samples(self) -> list[tuple[dict[str, str], Any]]:
+        samples = super().samples()
+        with self._lock:
+            functions = list(self._functions.items())
+        for key, function in functions:
+            samples.append((dict(zip(self.labelnames, key)), function()))
+        return samples
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non cumulative) counts, then sum and count.
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            # First bucket whose bound is >= value; past the end is +Inf
+            state[0][bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self) -> list[tuple[dict[str, str], Any]]:
+        result = []
+        for labels, (counts, total, count) in super().samples():
+            cumulative, running = {}, 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                running += bucket_count
+                cumulative["+Inf" if bound == float("inf") else repr(bound)] = running
+            result.append((labels, {"buckets": cumulative, "sum": total, "count": count}))
+        return result
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict[str, str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in labels.items()]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(registry: MetricsRegistry = registry) -> str:
+    """Render every metric in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for metric in registry.collect():
+        help_text = metric.documentation.replace("\\", "\\\\").replace("\n", "\\n")
+        lines.append(f"# HELP {metric.name} {help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for labels, value in metric.samples():
+            if metric.kind != "histogram":
+                lines.append(f"{metric.name}{_labels(labels)} {_number(value)}")
+                continue
+            for bound, count in value["buckets"].items():
+                le = 'le="' + bound + '"'
+                lines.append(f"{metric.name}_bucket{_labels(labels, le)} {count}")
+            lines.append(f"{metric.name}_sum{_labels(labels)} {_number(value['sum'])}")
+            lines.append(f"{metric.name}_count{_labels(labels)} {value['count']}")
+    return "\n".join(lines) + "\n"
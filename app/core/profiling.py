@@ -0,0 +1,374 @@
+"""
+Stack sampling profilers.
+
+``RequestProfile`` samples one request at a high rate while it runs. A
+sample is the request's own stack: its coroutine chain while the task runs
+on the event loop or awaits, extended with the worker thread stack while a
+sync endpoint or dependency runs on the threadpool for it. Threadpool work
+is attributed through the context the worker runs it in, so concurrent
+requests never leak into each other's profile.
+
+``ContinuousProfiler`` samples every busy thread at a low rate for the life
+of the process and aggregates the hottest stacks across all requests.
+
+Both produce folded stacks (``frame;frame;frame count`` per line), the input
+of flamegraph.pl, inferno and speedscope. Time spent in the database shows
+up as a ``[sql] <normalized statement>`` leaf; ``install`` hooks the engine
+cursor events that provide it and the exact per-statement timings kept on
+request profiles.
+"""
+
+import asyncio
+import queue
+import sys
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import lru_cache
+from types import CodeType, FrameType
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.slow_query import normalize_sql
+
+try:
+    # Threadpool workers keep the context of the call they run in a local of
+    # this method; reading it is how worker stacks are matched to a request.
+    from anyio._backends._asyncio import WorkerThread
+    _WORKER_RUN: CodeType | None = WorkerThread.run.__code__
+except (ImportError, AttributeError):  # threadpool stacks are then not attributed
+    _WORKER_RUN = None
+
+_QUEUE_GET = queue.Queue.get.__code__
+
+_current: ContextVar["RequestProfile | None"] = ContextVar("request_profile", default=None)
+
+# Statement being executed per thread, for sync engines only; async drivers
+# run statements while the event loop serves other requests
+_running_sql: dict[int, str] = {}
+
+# Threads that sample, never sampled themselves
+_sampler_threads: set[int] = set()
+
+_frame_names: dict[CodeType, str] = {}
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    name = _frame_names.get(code)
+    if name is None:
+        module = frame.f_globals.get("__name__", "?")
+        name = _frame_names[code] = f"{module}:{code.co_qualname}".replace(";", ",")
+    return name
+
+
+@lru_cache(maxsize=1024)
+def _sql_frame(statement: str) -> str:
+    return "[sql] " + normalize_sql(statement).replace(";", ",")
+
+
+def _thread_frames(leaf: FrameType, stop: FrameType | None = None) -> tuple[list[FrameType], FrameType | None]:
+    """
+    Frames from the thread root (or the threadpool worker loop) to ``leaf``.
+
+    Returns:
+        The frames, root first, and the worker loop frame when the walk
+        stopped there
+    """
+    frames = []
+    frame = leaf
+    while frame is not None:
+        if frame.f_code is _WORKER_RUN:
+            frames.reverse()
+            return frames, frame
+        frames.append(frame)
+        if frame is stop:
+            break
+        frame = frame.f_back
+    frames.reverse()
+    return frames, None
+
+
+def _await_frames(coro: Any) -> list[FrameType]:
+    """Frames of a suspended coroutine chain, outermost first."""
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return frames
+
+
+def _is_idle(frames: list[FrameType]) -> bool:
+    leaf = frames[-1]
+    module = leaf.f_globals.get("__name__")
+    # Event loop waiting in select(), threads parked on a condition or queue
+    if module == "selectors" or (module in ("threading", "queue") and leaf.f_code.co_name in ("wait", "get")):
+        # Waiting for a pooled connection is worth showing
+        return not any(frame.f_globals.get("__name__") == "sqlalchemy.pool.impl" for frame in frames)
+    return False
+
+
+def _fold(stacks: dict[tuple[str, ...], int]) -> str:
+    lines = [f"{';'.join(stack)} {count}" for stack, count in sorted(stacks.items(), key=lambda item: -item[1])]
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+class _Sampler(ABC):
+    """Daemon thread calling ``sample`` every ``interval`` seconds until stopped."""
+
+    def __init__(self, name: str, interval: float):
+        self.name = name
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @abstractmethod
+    def sample(self) -> None:
+        """Take one sample; runs on the sampler thread."""
+
+    def _run(self) -> None:
+        _sampler_threads.add(threading.get_ident())
+        try:
+            while not self._stop.wait(self.interval):
+                self.sample()
+        finally:
+            _sampler_threads.discard(threading.get_ident())
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+
+class RequestProfile(_Sampler):
+    """Profile of one request; create it inside the request's task."""
+
+    def __init__(self, method: str, path: str, interval: float):
+        super().__init__("request-profiler", interval)
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.status: int | None = None
+        self.duration_ms: float | None = None
+        self.samples = 0
+        self.stacks: dict[tuple[str, ...], int] = {}
+        self.statements: list[tuple[str, float]] = []
+        self._sql: tuple[str, float] | None = None
+        self._task = asyncio.current_task()
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._token = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        self._token = _current.set(self)
+        self._started = time.perf_counter()
+        super().start()
+
+    def finish(self, status: int | None) -> None:
+        self.stop()
+        self.duration_ms = round((time.perf_counter() - self._started) * 1000, 3)
+        self.status = status
+        _current.reset(self._token)
+
+    def sql_started(self, statement: str) -> None:
+        self._sql = (statement, time.perf_counter())
+
+    def sql_finished(self) -> None:
+        if self._sql is not None:
+            statement, started = self._sql
+            self._sql = None
+            self.statements.append((statement, (time.perf_counter() - started) * 1000))
+
+    def sample(self) -> None:
+        task = self._task
+        if task is None or task.done():
+            return
+        thread_frames = sys._current_frames()
+        root = task.get_coro()
+        root_frame = getattr(root, "cr_frame", None)
+
+        stacks = []
+        for ident, leaf in thread_frames.items():
+            if ident == self._loop_thread or ident in _sampler_threads:
+                continue
+            frames, worker_run = _thread_frames(leaf)
+            if worker_run is None or not frames or frames[0].f_code is _QUEUE_GET:
+                continue
+            context = worker_run.f_locals.get("context")
+            if context is not None and context.get(_current) is self:
+                # Rooted under the coroutine awaiting the threadpool
+                stacks.append(_await_frames(root) + frames)
+
+        if not stacks:
+            if asyncio.current_task(self._loop) is task and self._loop_thread in thread_frames:
+                frames, _ = _thread_frames(thread_frames[self._loop_thread], stop=root_frame)
+            else:
+                frames = _await_frames(root)
+            stacks.append(frames)
+
+        sql = self._sql
+        for frames in stacks:
+            names = [f"{self.method} {self.path}"] + [_frame_name(frame) for frame in frames]
+            if sql is not None:
+                names.append(_sql_frame(sql[0]))
+            key = tuple(names)
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+        self.samples += 1
+
+    def folded(self) -> str:
+        return _fold(dict(self.stacks))
+
+    def summary(self) -> dict[str, Any]:
+        by_statement: dict[str, list[float]] = {}
+        for statement, duration_ms in list(self.statements):
+            entry = by_statement.setdefault(normalize_sql(statement), [0, 0.0])
+            entry[0] += 1
+            entry[1] += duration_ms
+        sql_ms = sum(total for _, total in by_statement.values())
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "samples": self.samples,
+            "interval_ms": self.interval * 1000,
+            "sql": {
+                "count": sum(count for count, _ in by_statement.values()),
+                "total_ms": round(sql_ms, 3),
+                "statements": [
+                    {"statement": statement, "count": count, "total_ms": round(total, 3)}
+                    for statement, (count, total) in sorted(by_statement.items(), key=lambda item: -item[1][1])
+                ],
+            },
+        }
+
+
+class ProfileStore:
+    """Ring buffer of the most recent request profiles."""
+
+    def __init__(self, size: int):
+        self._profiles: deque[RequestProfile] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+
+    def get(self, profile_id: str) -> RequestProfile | None:
+        with self._lock:
+            return next((profile for profile in self._profiles if profile.id == profile_id), None)
+
+    def summaries(self) -> list[dict[str, Any]]:
+        with self._lock:
+            profiles = list(reversed(self._profiles))
+        return [profile.summary() for profile in profiles]
+
+
+class ContinuousProfiler(_Sampler):
+    """Low-rate sampler aggregating the stacks of every busy thread."""
+
+    OTHER = ("[other]",)
+
+    def __init__(self, interval: float, max_stacks: int):
+        super().__init__("continuous-profiler", interval)
+        self.max_stacks = max_stacks
+        self.samples = 0
+        self.since = datetime.now(timezone.utc).isoformat()
+        self._stacks: dict[tuple[str, ...], int] = {}
+        self._lock = threading.Lock()
+
+    def sample(self) -> None:
+        stacks = []
+        for ident, leaf in sys._current_frames().items():
+            if ident in _sampler_threads:
+                continue
+            frames, worker_run = _thread_frames(leaf)
+            if not frames or (worker_run is not None and frames[0].f_code is _QUEUE_GET) or _is_idle(frames):
+                continue
+            names = [_frame_name(frame) for frame in frames]
+            statement = _running_sql.get(ident)
+            if statement is not None:
+                names.append(_sql_frame(statement))
+            stacks.append(tuple(names))
+
+        with self._lock:
+            for key in stacks:
+                if key not in self._stacks and len(self._stacks) >= self.max_stacks:
+                    key = self.OTHER
+                self._stacks[key] = self._stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def folded(self, top: int | None = None) -> str:
+        with self._lock:
+            stacks = dict(self._stacks)
+        if top is not None:
+            stacks = dict(sorted(stacks.items(), key=lambda item: -item[1])[:top])
+        return _fold(stacks)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stacks.clear()
+            self.samples = 0
+            self.since = datetime.now(timezone.utc).isoformat()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not conn.dialect.is_async:
+        _running_sql[threading.get_ident()] = statement
+    profile = _current.get()
+    if profile is not None:
+        profile.sql_started(statement)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _statement_done()
+
+
+def _handle_error(exception_context):
+    _statement_done()
+
+
+def _statement_done() -> None:
+    _running_sql.pop(threading.get_ident(), None)
+    profile = _current.get()
+    if profile is not None:
+        profile.sql_finished()
+
+
+def install(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+profile_store = ProfileStore(settings.PROFILING_STORE_SIZE)
+continuous_profiler = ContinuousProfiler(
+    interval=settings.PROFILING_CONTINUOUS_INTERVAL_SECONDS,
+    max_stacks=settings.PROFILING_CONTINUOUS_MAX_STACKS,
+)
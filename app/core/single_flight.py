@@ -0,0 +1,101 @@
+"""
+Single-flight request coalescing.
+
+``SingleFlight.run`` executes at most one computation per key at a time on
+the event loop: callers that arrive while one is in flight wait for its
+result instead of repeating the same queries. With ``stale_ttl`` set, the
+last result for a key is kept and returned to those callers right away
+while the refresh is running, as long as it is no older than ``stale_ttl``.
+
+Results are shared between requests, so computations must return values
+that nobody mutates afterwards (plain data, not ``Response`` objects).
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from app.core.cache import TTLCache
+from app.core.metrics import Counter
+from app.core.trace_context import annotate
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+flight_requests = Counter(
+    "single_flight_requests_total",
+    "Coalescable requests by whether they computed, waited or got a stale result",
+    ["flight", "outcome"],
+)
+
+
+class SingleFlight:
+    def __init__(self, name: str, stale_ttl: float = 0.0, maxsize: int = 1024, enabled: bool = True):
+        """
+        Args:
+            name: Flight name, used in metrics and the stale cache name
+            stale_ttl: Seconds a finished result may be served to callers
+                       while a newer computation is in flight, 0 disables
+            maxsize: Keys kept for stale serving
+            enabled: When False every caller computes on its own
+        """
+        self.name = name
+        self.enabled = enabled
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+        self._stale = TTLCache(f"{name}_stale", maxsize=maxsize, ttl=stale_ttl) if stale_ttl > 0 else None
+
+    async def run(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        if not self.enabled:
+            return await compute()
+        future = self._in_flight.get(key)
+        if future is None:
+            return await self._lead(key, compute)
+
+        if self._stale is not None:
+            value = self._stale.get(key, _MISSING)
+            if value is not _MISSING:
+                flight_requests.inc(flight=self.name, outcome="stale")
+                annotate(f"single_flight.{self.name}", "stale")
+                return value
+
+        flight_requests.inc(flight=self.name, outcome="coalesced")
+        annotate(f"single_flight.{self.name}", "coalesced")
+        try:
+            # Shielded so that a waiter going away does not cancel the leader
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+        # The leader was cancelled (e.g. its client disconnected); compute ourselves
+        return await self.run(key, compute)
+
+    async def _lead(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        flight_requests.inc(flight=self.name, outcome="leader")
+        annotate(f"single_flight.{self.name}", "leader")
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await compute()
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved in case there are none
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            if self._stale is not None:
+                self._stale.set(key, result)
+            return result
+        finally:
+            if not future.done():
+                # Cancelled: waiters notice and compute for themselves
+                future.cancel()
+            del self._in_flight[key]
+
+
+def request_key(*parts: Any) -> tuple:
+    """Normalize request models and plain values into a hashable key."""
+    return tuple(
+        tuple(part.model_dump().values()) if hasattr(part, "model_dump") else part
+        for part in parts
+    )
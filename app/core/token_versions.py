@@ -0,0 +1,58 @@
+"""
+Per-user security versions for self-contained access tokens.
+
+Claims-mode access tokens carry the user's security version at issue time,
+read from the ``user.token_version`` column. Revoking (password change,
+deletion, privilege or email change) increments that column, which makes
+every previously issued token for the user fail the check, on every worker
+and across restarts.
+
+Workers check tokens against a copy of the column cached for
+``TOKEN_VERSION_CACHE_SECONDS``, so a check costs a database read at most
+once per user and interval. A revocation made by another worker is seen
+within that interval; the worker that revoked sees it at once. A token newer
+than the cached version (issued after a revocation elsewhere) is valid and
+moves the cached version forward.
+"""
+
+from typing import Callable
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Cached version of a user that no longer exists: no token is current
+_DELETED = float("inf")
+
+
+class SecurityVersions:
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache("security_version", maxsize=maxsize, ttl=ttl)
+
+    def is_current(self, user_id: int, version: int, load: Callable[[], int | None]) -> bool:
+        """
+        Args:
+            user_id: Subject of the token
+            version: Security version signed into the token
+            load: Reads the user's stored version, None when the user is gone
+        """
+        known = self._cache.get(user_id)
+        if known is None:
+            stored = load()
+            known = _DELETED if stored is None else stored
+            self._cache.set(user_id, known)
+        if version < known:
+            return False
+        if version > known:
+            # Issued after a revocation this worker has not seen yet
+            self._cache.set(user_id, version)
+        return True
+
+    def forget(self, user_id: int) -> None:
+        """Drop the cached version so the next check reads the stored one."""
+        self._cache.delete(user_id)
+
+
+security_versions = SecurityVersions(
+    maxsize=settings.USER_CACHE_SIZE,
+    ttl=settings.TOKEN_VERSION_CACHE_SECONDS,
+)
@@ -0,0 +1,62 @@
+"""
+Trace context.
+
+The span of the current request (or of the innermost traced call) lives in a
+context variable, so it follows the request across awaits and into
+``run_in_threadpool`` workers. This module has no dependencies, so generic
+helpers such as the caches can ``annotate`` spans without importing the
+tracer or the database layer.
+"""
+
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    name: str
+    kind: str
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def activate(span: Span):
+    """Make ``span`` the parent of spans started in this context; returns a reset token."""
+    return _current_span.set(span)
+
+
+def deactivate(token) -> None:
+    _current_span.reset(token)
+
+
+def annotate(key: str, value: Any) -> None:
+    """Set an attribute on the innermost open span, if the request is traced."""
+    span = _current_span.get()
+    if span is not None:
+        span.attributes[key] = value
@@ -0,0 +1,355 @@
+"""
+Lightweight request tracing.
+
+A trace starts at the edge (``app.api.tracing.TracingMiddleware``) with a
+span for the route. Functions decorated with ``traced`` (services and
+repository calls) add child spans, and ``app.db.tracing`` adds a span per
+SQL statement carrying its normalized text, shape id and row count.
+``annotate`` (``app.core.trace_context``) attaches flags such as cache hits
+to the innermost open span.
+
+Sampling is head based: whether a request is traced is decided once, when
+its root span starts, from ``TRACING_SAMPLE_RATE``. The sampled flag of an
+incoming W3C ``traceparent`` decides instead only when the request comes from
+a trusted upstream, so outside clients cannot force every request to be
+traced. Untraced requests pay one context variable lookup per instrumented
+call.
+
+Finished spans go through a bounded queue to a background thread that hands
+them in batches to the exporter: JSON lines in a local file, OTLP/HTTP JSON
+for a collector, or any ``SpanExporter`` named as ``module:Class``. When the
+queue is full spans are dropped and counted rather than slowing requests.
+"""
+
+import importlib
+import ipaddress
+import json
+import logging
+import queue
+import random
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Any, Callable, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import Counter
+from app.core.trace_context import Span, activate, current_span, deactivate
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+spans_total = Counter("tracing_spans_total", "Finished spans by what happened to them", ["outcome"])
+
+
+def _span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+def _trace_id() -> str:
+    return f"{random.getrandbits(128):032x}"
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str, bool] | None:
+    """Trace id, parent span id and sampled flag of a W3C ``traceparent``."""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+    try:
+        flags = int(parts[3], 16)
+        for part in parts[1:3]:
+            int(part, 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1], parts[2], bool(flags & 1)
+
+
+class SpanExporter(ABC):
+    """Receives batches of finished spans on the export thread."""
+
+    @abstractmethod
+    def export(self, spans: list[Span]) -> None:
+        """Send ``spans``; exceptions are logged and the batch counted as failed."""
+
+    def shutdown(self) -> None:
+        pass
+
+
+class FileExporter(SpanExporter):
+    """Appends spans to a file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def export(self, spans: list[Span]) -> None:
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write("".join(json.dumps(span.to_dict(), default=str) + "\n" for span in spans))
+        self._file.flush()
+
+    def shutdown(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+_OTLP_KINDS = {"server": 2, "sql": 3}  # everything else is INTERNAL (1)
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OTLPExporter(SpanExporter):
+    """Posts spans to an OpenTelemetry collector with OTLP/HTTP JSON."""
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def _span(self, span: Span) -> dict[str, Any]:
+        result = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": _OTLP_KINDS.get(span.kind, 1),
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+        }
+        if span.parent_id:
+            result["parentSpanId"] = span.parent_id
+        if span.error:
+            result["status"] = {"code": 2, "message": span.error}
+        return result
+
+    def export(self, spans: list[Span]) -> None:
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": "app"}, "spans": [self._span(span) for span in spans]}],
+            }]
+        }
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+def create_exporter(name: str) -> SpanExporter | None:
+    """Exporter for ``TRACING_EXPORTER``: none, file, otlp or ``module:Class``."""
+    if name == "none":
+        return None
+    if name == "file":
+        return FileExporter(settings.TRACING_FILE_PATH)
+    if name == "otlp":
+        return OTLPExporter(settings.TRACING_OTLP_ENDPOINT, service_name=settings.PROJECT_NAME)
+    module, _, attribute = name.partition(":")
+    if not attribute:
+        raise ValueError(f"Unknown tracing exporter {name!r}")
+    return getattr(importlib.import_module(module), attribute)()
+
+
+class Tracer:
+    def __init__(
+        self,
+        exporter: SpanExporter | None,
+        sample_rate: float,
+        queue_size: int = 2048,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        trusted_upstreams: list[str] | None = None,
+    ):
+        """
+        Args:
+            exporter: Destination of finished spans, None disables tracing
+            sample_rate: Share of requests to trace
+            queue_size: Finished spans held for export before dropping
+            batch_size: Largest batch handed to the exporter
+            flush_interval: Seconds a partial batch waits for more spans
+            trusted_upstreams: Addresses or networks whose ``traceparent``
+                               sampled flag is honoured
+        """
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.trusted_upstreams = [ipaddress.ip_network(net, strict=False) for net in trusted_upstreams or ()]
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue[Span | None] = queue.Queue(maxsize=queue_size)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def _trusted(self, client: str | None) -> bool:
+        if not self.trusted_upstreams or not client:
+            return False
+        try:
+            address = ipaddress.ip_address(client)
+        except ValueError:
+            return False
+        return any(address in network for network in self.trusted_upstreams)
+
+    def start_trace(
+        self, name: str, kind: str, traceparent: str | None = None, client: str | None = None
+    ) -> Span | None:
+        """Root span of a new trace, or None when the head decision is to skip it.
+
+        ``client`` is the caller's address; the sampled flag of ``traceparent``
+        only counts when it is a trusted upstream."""
+        if self.exporter is None:
+            return None
+        parent = parse_traceparent(traceparent)
+        trace_id, parent_id = parent[:2] if parent is not None else (None, None)
+        if parent is not None and self._trusted(client):
+            sampled = parent[2]
+        else:
+            sampled = random.random() < self.sample_rate
+        if not sampled:
+            return None
+        return Span(trace_id or _trace_id(), _span_id(), parent_id, name, kind, time.time_ns())
+
+    def start_span(self, name: str, kind: str, parent: Span) -> Span:
+        return Span(parent.trace_id, _span_id(), parent.span_id, name, kind, time.time_ns())
+
+    def end_span(self, span: Span) -> None:
+        span.end_ns = time.time_ns()
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            spans_total.inc(outcome="dropped")
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._export_loop, name="span-exporter", daemon=True)
+                self._thread.start()
+
+    def _export_loop(self) -> None:
+        stopping = False
+        while not stopping:
+            try:
+                span = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while span is not None:
+                batch.append(span)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    span = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            stopping = span is None
+            if batch:
+                self._export(batch)
+
+    def _export(self, batch: list[Span]) -> None:
+        try:
+            self.exporter.export(batch)
+        except Exception as e:
+            logger.warning("Could not export %d spans: %s", len(batch), e)
+            spans_total.inc(len(batch), outcome="failed")
+        else:
+            spans_total.inc(len(batch), outcome="exported")
+
+    def shutdown(self) -> None:
+        """Flush queued spans and stop the export thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout=5)
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+
+tracer = Tracer(
+    create_exporter(settings.TRACING_EXPORTER),
+    sample_rate=settings.TRACING_SAMPLE_RATE,
+    queue_size=settings.TRACING_QUEUE_SIZE,
+    trusted_upstreams=settings.TRACING_TRUSTED_UPSTREAMS,
+)
+
+
+def _finish(span: Span, result: Any) -> None:
+    if isinstance(result, (list, tuple)):
+        span.attributes["result.count"] = len(result)
+    tracer.end_span(span)
+
+
+def traced(name: str | None = None, kind: str = "internal") -> Callable[[F], F]:
+    """Trace calls to the decorated function, sync or async, as child spans."""
+
+    def decorate(function: F) -> F:
+        module = function.__module__.rsplit(".", 1)[-1]
+        span_name = name or f"{module}.{function.__qualname__}"
+
+        if iscoroutinefunction(function):
+            @wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                parent = current_span()
+                if parent is None:
+                    return await function(*args, **kwargs)
+                span = tracer.start_span(span_name, kind, parent)
+                token = activate(span)
+                result = None
+                try:
+                    result = await function(*args, **kwargs)
+                    return result
+                except BaseException as e:
+                    span.error = type(e).__name__
+                    raise
+                finally:
+                    deactivate(token)
+                    _finish(span, result)
+
+            return async_wrapper
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            parent = current_span()
+            if parent is None:
+                return function(*args, **kwargs)
+            span = tracer.start_span(span_name, kind, parent)
+            token = activate(span)
+            result = None
+            try:
+                result = function(*args, **kwargs)
+                return result
+            except BaseException as e:
+                span.error = type(e).__name__
+                raise
+            finally:
+                deactivate(token)
+                _finish(span, result)
+
+        return wrapper
+
+    return decorate
@@ -0,0 +1,128 @@
+"""
+Engine factory.
+
+Every module shares the engines built here from settings. Their pools are
+``QueuePool`` (or its asyncio adaptation) subclasses that time each checkout,
+so pool contention shows up in the metrics registry next to the pool size,
+overflow and checked-out connections.
+"""
+
+import time
+
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlmodel import create_engine
+
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, Histogram
+
+pool_checkouts = Counter("db_pool_checkouts_total", "Connections checked out of the pool", ["pool"])
+pool_timeouts = Counter("db_pool_timeouts_total", "Checkouts that timed out waiting for a connection", ["pool"])
+pool_wait_seconds = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+pool_checked_out = Gauge("db_pool_checked_out", "Connections currently checked out", ["pool"])
+pool_overflow = Gauge("db_pool_overflow", "Connections open beyond pool_size", ["pool"])
+pool_size = Gauge("db_pool_size", "Configured number of persistent connections", ["pool"])
+
+
+class _InstrumentedPoolMixin:
+    pool_name = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_timeouts.inc(pool=self.pool_name)
+            raise
+        pool_wait_seconds.observe(time.perf_counter() - started, pool=self.pool_name)
+        pool_checkouts.inc(pool=self.pool_name)
+        return connection
+
+
+def _is_in_memory_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _engine_options(url: URL, name: str, pool_base: type[QueuePool]) -> dict:
+    options = {
+        "echo": settings.DB_ECHO,
+        "query_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    if url.get_driver_name() == "psycopg":
+        threshold = settings.DB_PREPARE_THRESHOLD
+        options["connect_args"] = {"prepare_threshold": threshold if threshold >= 0 else None}
+    if not _is_in_memory_sqlite(url):
+        pool_class = type(
+            f"Instrumented{pool_base.__name__}_{name}",
+            (_InstrumentedPoolMixin, pool_base),
+            {"pool_name": name},
+        )
+        options.update(
+            poolclass=pool_class,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    return options
+
+
+def _register_pool_gauges(engine: Engine, name: str) -> None:
+    if _is_in_memory_sqlite(engine.url):
+        return
+    pool = engine.pool
+    pool_checked_out.set_function(pool.checkedout, pool=name)
+    pool_overflow.set_function(lambda: max(pool.overflow(), 0), pool=name)
+    pool_size.set_function(pool.size, pool=name)
+
+
+def create_db_engine(url: str | None = None, name: str = "primary") -> Engine:
+    """
+    Build an engine for ``url`` (the configured database by default).
+
+    Args:
+        url: Database URL, defaults to ``settings.SQLALCHEMY_DATABASE_URI``
+        name: Label for the pool metrics
+
+    Returns:
+        Engine: Pooled engine with pool metrics registered under ``name``
+    """
+    url = make_url(url or settings.SQLALCHEMY_DATABASE_URI)
+    engine = create_engine(url, **_engine_options(url, name, QueuePool))
+    _register_pool_gauges(engine, name)
+    return engine
+
+
+def to_async_url(url: str | URL) -> URL:
+    """Swap the driver for its asyncio counterpart (psycopg serves both)."""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    if url.get_backend_name() == "postgresql":
+        return url.set(drivername="postgresql+psycopg")
+    return url
+
+
+def create_async_db_engine(url: str | None = None, name: str = "primary_async") -> AsyncEngine:
+    """
+    Build an asyncio engine for ``url`` (the configured database by default).
+
+    Args:
+        url: Database URL in its sync or async form
+        name: Label for the pool metrics
+
+    Returns:
+        AsyncEngine: Pooled async engine with pool metrics registered under ``name``
+    """
+    url = to_async_url(url or settings.SQLALCHEMY_DATABASE_URI)
+    engine = create_async_engine(url, **_engine_options(url, name, AsyncAdaptedQueuePool))
+    _register_pool_gauges(engine.sync_engine, name)
+    return engine
@@ -1,11 +1,11 @@
-from sqlmodel import Session, create_engine, select, SQLModel
+from sqlmodel import Session, select, SQLModel
 
 from app.service import user_service
 from app.core.config import settings
 from app.schema.user import UserCreate
 
 from app.model import *
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+from app.db.session import engine
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
 # otherwise, SQLModel might fail to initialize relationships properly
@@ -0,0 +1,98 @@
+"""
+Read replica routing.
+
+Catalog reads are spread round-robin over the replicas in
+``DB_REPLICA_URLS``. The database is chosen when a read session first needs a
+connection: a replica that refuses one is marked down for
+``DB_REPLICA_RETRY_SECONDS`` and the next one is tried, with the primary as the
+last resort. Writes always use the primary.
+
+Read-your-writes: when a request commits on the primary its client key (the
+bearer token subject, else the client IP) is remembered for
+``DB_REPLICA_STICKY_SECONDS``, and that client's reads stay on the primary
+until replication has had time to catch up.
+"""
+
+import itertools
+import threading
+import time
+from collections.abc import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session
+
+from app.core.cache import TTLCache
+from app.core.metrics import Counter, Gauge
+
+read_routes = Counter(
+    "db_read_routes_total", "Read sessions opened per target database", ["target", "reason"]
+)
+replica_failures = Counter(
+    "db_replica_failures_total", "Replica connection failures that triggered a failover", ["replica"]
+)
+replica_up = Gauge("db_replica_up", "1 while the replica is eligible for reads", ["replica"])
+
+
+class Replica:
+    def __init__(self, name: str, engine: Engine, async_engine: AsyncEngine | None = None):
+        self.name = name
+        self.engine = engine
+        self.async_engine = async_engine
+        self.down_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return self.down_until <= time.monotonic()
+
+    def bind(self, use_async: bool) -> Engine:
+        """Engine a session binds to; async sessions use the async engine's sync facade."""
+        return self.async_engine.sync_engine if use_async else self.engine
+
+
+class ReplicaRouter:
+    def __init__(self, replicas: list[Replica], retry_after: float, sticky_seconds: float, sticky_keys: int):
+        self.replicas = replicas
+        self.retry_after = retry_after
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.recent_writers = TTLCache("replica_sticky_client", maxsize=sticky_keys, ttl=sticky_seconds)
+        for replica in replicas:
+            replica_up.set_function(lambda replica=replica: int(replica.healthy), replica=replica.name)
+
+    def candidates(self, client_key: str) -> Iterator[Replica]:
+        """
+        Replicas to try for a read, in round-robin order, skipping those
+        marked down. Yields nothing when the client must read from the primary.
+        """
+        if not self.replicas:
+            read_routes.inc(target="primary", reason="no_replica")
+            return
+        if self.recent_writers.get(client_key):
+            read_routes.inc(target="primary", reason="sticky")
+            return
+
+        with self._lock:
+            start = next(self._counter)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if replica.healthy:
+                yield replica
+        read_routes.inc(target="primary", reason="failover")
+
+    def record_route(self, replica: Replica) -> None:
+        read_routes.inc(target=replica.name, reason="replica")
+
+    def mark_down(self, replica: Replica) -> None:
+        replica.down_until = time.monotonic() + self.retry_after
+        replica_failures.inc(replica=replica.name)
+
+    def record_write(self, client_key: str) -> None:
+        if self.replicas:
+            self.recent_writers.set(client_key, True)
+
+
+@event.listens_for(Session, "after_commit")
+def _flag_write(session: Session) -> None:
+    session.info["committed"] = True
@@ -1,19 +1,223 @@
-from sqlmodel import create_engine
+from collections.abc import Iterator
+from typing import Any, Awaitable, Callable
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
+from app.core import profiling
 from app.core.config import settings
-from app.db.init_db import init_db
+from app.core.metrics import Counter
+from app.core.security import bearer_subject
+from app.db.engine import create_async_db_engine, create_db_engine
+from app.db.replicas import Replica, ReplicaRouter
+from app.db import statement_timeout, tracing
+from app.db.slow_query import recorder
 
 if settings.SQLALCHEMY_DATABASE_URI is None:
     raise ValueError("DATABASE_URL is not set")
 
-# engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, echo=True)
-#
-engine = create_engine("sqlite:///C:/Users/Admin/Downloads/test (2).db", echo=True)
 
-async def get_db():
-    with Session(engine) as session:
-        try :
-            yield session
-        finally:
+def _instrument(engine: Engine) -> None:
+    recorder.install(engine)
+    statement_timeout.install(engine)
+    profiling.install(engine)
+    tracing.install(engine)
+
+
+engine = create_db_engine()
+_instrument(engine)
+
+async_engine = create_async_db_engine() if settings.DB_ASYNC_READS else None
+if async_engine is not None:
+    _instrument(async_engine.sync_engine)
+
+
+def _create_replica(index: int, url: str) -> Replica:
+    name = f"replica{index}"
+    replica = Replica(name, create_db_engine(url, name=name))
+    _instrument(replica.engine)
+    if settings.DB_ASYNC_READS:
+        replica.async_engine = create_async_db_engine(url, name=f"{name}_async")
+        _instrument(replica.async_engine.sync_engine)
+    return replica
+
+
+read_router = ReplicaRouter(
+    [_create_replica(index, url) for index, url in enumerate(settings.DB_REPLICA_URLS)],
+    retry_after=settings.DB_REPLICA_RETRY_SECONDS,
+    sticky_seconds=settings.DB_REPLICA_STICKY_SECONDS,
+    sticky_keys=settings.DB_REPLICA_STICKY_KEYS,
+)
+
+
+request_sessions = Counter(
+    "db_request_sessions_total", "Sessions opened by request dependencies", ["dependency"]
+)
+sessions_without_checkout = Counter(
+    "db_request_sessions_without_checkout_total",
+    "Request sessions closed without ever checking out a connection",
+    ["dependency"],
+)
+
+
+@event.listens_for(Session, "after_begin")
+def _flag_checkout(session: Session, transaction, connection) -> None:
+    session.info["checked_out"] = True
+
+
+def client_key(request: Request) -> str:
+    user_id = bearer_subject(request.headers.get("Authorization"))
+    if user_id is not None:
+        return f"user:{user_id}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+class ReadSession(Session):
+    """
+    Session for catalog reads that picks its database on first use: the next
+    healthy replica when configured (see ``ReplicaRouter.candidates``), else
+    the primary it was created with. There is no probe: when the replica
+    refuses the session's own connection it is marked down and the session
+    moves on to the next candidate, then to the primary.
+    """
+
+    def __init__(self, *args: Any, client_key: str | None = None, use_async: bool = False, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._client_key = client_key
+        self._use_async = use_async
+        self._routed_bind = None
+        self._replica: Replica | None = None
+        self._candidates: Iterator[Replica] = iter(())
+
+    def _route_next(self) -> None:
+        self._replica = next(self._candidates, None)
+        self._routed_bind = self._replica.bind(self._use_async) if self._replica is not None else self.bind
+
+    def get_bind(self, mapper=None, **kwargs: Any):
+        if self._routed_bind is None:
+            if self._client_key is not None:
+                self._candidates = read_router.candidates(self._client_key)
+                self._route_next()
+            else:
+                self._routed_bind = super().get_bind(mapper, **kwargs)
+        return self._routed_bind
+
+    def _connection_for_bind(self, engine, execution_options=None, **kw: Any):
+        while True:
+            try:
+                connection = super()._connection_for_bind(engine, execution_options, **kw)
+            except OperationalError:
+                if self._replica is None or engine is not self._routed_bind:
+                    raise
+                read_router.mark_down(self._replica)
+                self._route_next()
+                engine = self._routed_bind
+                continue
+            if self._replica is not None and not self.info.get("replica_routed"):
+                self.info["replica_routed"] = True
+                read_router.record_route(self._replica)
+            return connection
+
+
+def _apply_deadline(session: Session | AsyncSession, request: Request) -> None:
+    """Hand the request's latency budget, if any, to the session (see statement_timeout)."""
+    deadline = getattr(request.state, "deadline", None)
+    if deadline is not None:
+        info = session.sync_session.info if isinstance(session, AsyncSession) else session.info
+        info["deadline"] = deadline
+        info["route"] = request.state.deadline_route
+
+
+async def _release(session: Session | AsyncSession, dependency: str) -> None:
+    """Close a request session; returning a used connection may block, so not on the loop."""
+    request_sessions.inc(dependency=dependency)
+    if isinstance(session, AsyncSession):
+        checked_out = session.sync_session.info.get("checked_out")
+        await session.close()
+    else:
+        checked_out = session.info.get("checked_out")
+        if checked_out:
+            await run_in_threadpool(session.close)
+        else:
             session.close()
+    if not checked_out:
+        sessions_without_checkout.inc(dependency=dependency)
+
+
+async def get_db(request: Request):
+    # Sessions are lazy: no connection is checked out until the first
+    # statement, so requests answered from a cache never touch the pool
+    session = Session(engine)
+    _apply_deadline(session, request)
+    try:
+        yield session
+    finally:
+        if session.info.get("committed") and read_router.replicas:
+            read_router.record_write(client_key(request))
+        await _release(session, "get_db")
+
+
+async def get_async_db():
+    session = AsyncSession(async_engine, expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        await _release(session, "get_async_db")
+
+
+async def get_read_db(request: Request):
+    """
+    Session for read-only catalog endpoints, async when DB_ASYNC_READS is on.
+    Bound to a replica or the primary when it first runs a statement.
+    """
+    key = client_key(request) if read_router.replicas else None
+    if async_engine is None:
+        session = ReadSession(engine, client_key=key)
+    else:
+        session = AsyncSession(
+            async_engine,
+            expire_on_commit=False,
+            sync_session_class=ReadSession,
+            client_key=key,
+            use_async=True,
+        )
+    _apply_deadline(session, request)
+    try:
+        yield session
+    finally:
+        await _release(session, "get_read_db")
+
+
+async def run_read(
+    session: Session | AsyncSession,
+    sync_fn: Callable[..., Any],
+    async_fn: Callable[..., Awaitable[Any]],
+    **kwargs: Any,
+) -> Any:
+    """Run the async service variant natively, or the sync one on the threadpool."""
+    if isinstance(session, AsyncSession):
+        return await async_fn(session=session, **kwargs)
+    return await run_in_threadpool(sync_fn, session=session, **kwargs)
+
+
+async def run_read_data(
+    session: Session | AsyncSession,
+    sync_fn: Callable[..., Any],
+    async_fn: Callable[..., Awaitable[Any]],
+    **kwargs: Any,
+) -> Any:
+    """``run_read`` for model results that outlive the request (single flight,
+    caches): dumped to JSON-ready data while their session is still in use."""
+
+    def dump(**kwargs: Any) -> Any:
+        return sync_fn(**kwargs).model_dump(mode="json")
+
+    async def dump_async(**kwargs: Any) -> Any:
+        return (await async_fn(**kwargs)).model_dump(mode="json")
+
+    return await run_read(session, dump, dump_async, **kwargs)
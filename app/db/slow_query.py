@@ -0,0 +1,204 @@
+"""
+Slow statement recorder.
+
+Hooks the SQLAlchemy engine cursor events and keeps the statements that
+exceed ``settings.SLOW_QUERY_THRESHOLD_MS`` in a bounded ring buffer, together
+with the bound-parameter shape, the duration and the service function that
+issued them. A sample of slow SELECTs can optionally be re-run under EXPLAIN
+so the plan is captured next to the statement. The EXPLAIN runs afterwards
+on a background thread over its own pooled connection, in a transaction that
+is rolled back, so it neither delays the request nor touches its transaction.
+"""
+
+import logging
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%\([^)]+\)s|:\w+|\$\d+)\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_SERVICE_PACKAGE = "app.service."
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    parameters: Any
+    duration_ms: float
+    caller: Optional[str]
+    recorded_at: str
+    plan: Optional[Any] = field(default=None)
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse whitespace and replace literals so equal shapes compare equal."""
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _IN_LIST.sub("IN (...)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """Describe bound parameters by name and type, never by value."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return {"executemany": len(parameters), "row": parameter_shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+def _find_caller() -> Optional[str]:
+    """Return the innermost ``app.service`` function on the current stack."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(_SERVICE_PACKAGE):
+            return f"{module[len(_SERVICE_PACKAGE):]}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class SlowQueryRecorder:
+    """Thread-safe ring buffer of statements slower than the threshold."""
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        size: int,
+        explain: bool = False,
+        explain_sample_rate: float = 0.0,
+        explain_queue_size: int = 16,
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.explain_sample_rate = explain_sample_rate
+        self._entries: deque[SlowQuery] = deque(maxlen=size)
+        self._lock = threading.Lock()
+        # Pending EXPLAINs; when full, further plans are skipped rather than queued
+        self._explain_queue: queue.Queue = queue.Queue(maxsize=explain_queue_size)
+        self._explain_thread: threading.Thread | None = None
+
+    def install(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start_time"].pop()
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        entry = SlowQuery(
+            statement=normalize_sql(statement),
+            parameters=parameter_shape(parameters),
+            duration_ms=round(duration_ms, 3),
+            caller=_find_caller(),
+            recorded_at=datetime.now(timezone.utc).isoformat(),
+        )
+        logger.warning(
+            "Slow query (%.1f ms) from %s: %s", entry.duration_ms, entry.caller, entry.statement
+        )
+        with self._lock:
+            self._entries.append(entry)
+        if self._should_explain(statement, executemany):
+            self._submit_explain(entry, conn.engine, statement, parameters)
+
+    def _handle_error(self, exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+    def _should_explain(self, statement: str, executemany: bool) -> bool:
+        if not self.explain or executemany:
+            return False
+        # EXPLAIN ANALYZE executes the statement, so only ever re-run plain
+        # SELECTs (a WITH may wrap an INSERT, UPDATE or DELETE).
+        if not statement.lstrip().upper().startswith("SELECT"):
+            return False
+        return random.random() < self.explain_sample_rate
+
+    def _submit_explain(self, entry: SlowQuery, engine: Engine, statement: str, parameters: Any) -> None:
+        if engine.dialect.name not in ("postgresql", "sqlite"):
+            return
+        try:
+            self._explain_queue.put_nowait((entry, engine, statement, parameters))
+        except queue.Full:
+            return
+        if self._explain_thread is None:
+            with self._lock:
+                if self._explain_thread is None:
+                    self._explain_thread = threading.Thread(
+                        target=self._explain_worker, name="slow-query-explain", daemon=True
+                    )
+                    self._explain_thread.start()
+
+    def _explain_worker(self) -> None:
+        while True:
+            entry, engine, statement, parameters = self._explain_queue.get()
+            plan = self._explain(engine, statement, parameters)
+            with self._lock:
+                entry.plan = plan
+
+    def _explain(self, engine: Engine, statement: str, parameters: Any) -> Optional[Any]:
+        dialect = engine.dialect.name
+        if dialect == "postgresql":
+            prefix = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+        else:
+            prefix = "EXPLAIN QUERY PLAN "
+
+        try:
+            # A connection of its own, rolled back when it is returned to the pool;
+            # the raw cursor keeps the EXPLAIN out of the engine's cursor hooks
+            with engine.connect() as conn:
+                cursor = conn.connection.cursor()
+                try:
+                    cursor.execute(prefix + statement, parameters)
+                    rows = cursor.fetchall()
+                finally:
+                    cursor.close()
+        except Exception as e:
+            logger.info("Could not capture plan for slow query: %s", e)
+            return None
+
+        if dialect == "postgresql":
+            return rows[0][0] if rows else None
+        return [" ".join(str(column) for column in row) for row in rows]
+
+    def entries(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [asdict(entry) for entry in reversed(self._entries)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+recorder = SlowQueryRecorder(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    size=settings.SLOW_QUERY_LOG_SIZE,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+    explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+)
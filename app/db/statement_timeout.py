@@ -0,0 +1,124 @@
+"""
+Request deadlines enforced by the database.
+
+A request with a latency budget (see ``app.api.latency_budget``) stores its
+deadline in ``session.info``. When the session begins a transaction the
+remaining budget is handed to the database: Postgres gets a
+``SET LOCAL statement_timeout`` scoped to that transaction, SQLite connections
+carry a progress handler that interrupts the running statement once the
+deadline has passed. Either way the query is cancelled by the server rather
+than abandoned, the connection stays usable and the error surfaces as
+``DeadlineExceeded``.
+"""
+
+import inspect
+import logging
+import time
+import zlib
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.util import await_only
+from sqlmodel import Session
+
+from app.core.metrics import Counter
+from app.db.slow_query import normalize_sql
+
+logger = logging.getLogger(__name__)
+
+# SQLite calls the progress handler every this many virtual machine steps
+SQLITE_PROGRESS_STEPS = 1000
+
+# Postgres query_canceled, raised for statement_timeout
+_QUERY_CANCELED = "57014"
+
+statement_timeouts = Counter(
+    "db_statement_timeouts_total",
+    "Requests whose latency budget ran out in the database",
+    ["route", "shape", "cancelled"],
+)
+
+
+class DeadlineExceeded(Exception):
+    """
+    The request ran out of its latency budget.
+
+    ``cancelled`` is True when a running statement was cancelled by the
+    database, False when the budget was spent before the query was sent.
+    """
+
+    def __init__(self, route: str | None, shape: str | None, cancelled: bool):
+        super().__init__(f"Latency budget exceeded on {route}")
+        self.route = route
+        self.shape = shape
+        self.cancelled = cancelled
+
+
+def statement_shape(statement: str) -> str:
+    """Short, stable label for a statement; the full text is logged next to it."""
+    return f"{zlib.crc32(normalize_sql(statement).encode()):08x}"
+
+
+def _is_cancellation(exception: BaseException) -> bool:
+    if getattr(exception, "sqlstate", None) == _QUERY_CANCELED:
+        return True
+    # sqlite3 reports a progress handler abort as "interrupted"
+    return str(exception) == "interrupted"
+
+
+def _install_progress_handler(dbapi_connection, connection_record) -> None:
+    info = connection_record.info
+
+    def interrupt() -> bool:
+        deadline = info.get("deadline")
+        return deadline is not None and time.monotonic() > deadline
+
+    result = connection_record.driver_connection.set_progress_handler(interrupt, SQLITE_PROGRESS_STEPS)
+    if inspect.isawaitable(result):
+        # aiosqlite; pool connects run inside the async engine's greenlet
+        await_only(result)
+
+
+def _clear_deadline(dbapi_connection, connection_record) -> None:
+    if connection_record is not None:
+        connection_record.info.pop("deadline", None)
+        connection_record.info.pop("route", None)
+
+
+def _handle_error(context) -> None:
+    conn = context.connection
+    if conn is None or conn.info.get("deadline") is None:
+        return
+    if not _is_cancellation(context.original_exception):
+        return
+    route = conn.info.get("route")
+    shape = statement_shape(context.statement or "")
+    statement_timeouts.inc(route=route, shape=shape, cancelled=True)
+    logger.warning("Statement %s on %s cancelled at the request deadline: %s",
+                   shape, route, normalize_sql(context.statement or ""))
+    raise DeadlineExceeded(route, shape, cancelled=True) from context.original_exception
+
+
+def install(engine: Engine) -> None:
+    """Translate deadline cancellations on ``engine`` (install after the slow query recorder)."""
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _install_progress_handler)
+    event.listen(engine, "checkin", _clear_deadline)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_deadline(session: Session, transaction, connection) -> None:
+    deadline = session.info.get("deadline")
+    if deadline is None:
+        return
+    route = session.info.get("route")
+    connection.info["deadline"] = deadline
+    connection.info["route"] = route
+
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        statement_timeouts.inc(route=route, shape="", cancelled=False)
+        raise DeadlineExceeded(route, None, cancelled=False)
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(int(remaining * 1000), 1)}")
@@ -0,0 +1,61 @@
+"""
+SQL statement spans.
+
+``install`` hooks an engine's cursor events so every statement of a traced
+request becomes a child span of the innermost open one, carrying its
+normalized text, shape id and row count. Nothing is installed while tracing
+is disabled.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.trace_context import current_span
+from app.core.tracing import tracer
+from app.db.slow_query import normalize_sql
+from app.db.statement_timeout import statement_shape
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = current_span()
+    if parent is None:
+        return
+    verb = (statement.split(None, 1) or ["?"])[0].upper()
+    span = tracer.start_span(f"db {verb}", "sql", parent)
+    span.attributes["db.system"] = conn.dialect.name
+    conn.info.setdefault("trace_spans", []).append(span)
+
+
+def _end_statement(conn, statement: str, rowcount: int | None, error: str | None) -> None:
+    spans = conn.info.get("trace_spans")
+    if not spans:
+        return
+    span = spans.pop()
+    span.attributes["db.statement"] = normalize_sql(statement)
+    span.attributes["db.shape"] = statement_shape(statement)
+    if rowcount is not None and rowcount >= 0:
+        # Drivers report -1 when the count is unknown (SELECT on sqlite)
+        span.attributes["db.rows"] = rowcount
+    span.error = error
+    tracer.end_span(span)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _end_statement(conn, statement, cursor.rowcount, None)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None:
+        _end_statement(
+            conn, exception_context.statement or "", None, type(exception_context.original_exception).__name__
+        )
+
+
+def install(engine: Engine) -> None:
+    """Add a span per SQL statement of traced requests on ``engine``."""
+    if not tracer.enabled:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -2,7 +2,8 @@ import logging
 
 from sqlmodel import Session
 
-from app.db.init_db import engine, init_db
+from app.db.init_db import init_db
+from app.db.session import engine
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
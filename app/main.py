@@ -1,31 +1,201 @@
-import sentry_sdk
-from fastapi import FastAPI
+"""
+Application factory.
+
+``create_app`` builds the FastAPI application; ``uvicorn --factory
+app.main:create_app`` uses it directly. ``app.main:app`` still works and
+builds the application on first access. Optional integrations (Sentry) are
+only imported when configured.
+"""
+
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
+from app.api.admission import AdmissionControl, RouteClass
+from app.api.compression import CompressionMiddleware
 from app.api.main import api_router
+from app.api.memory import AllocationMiddleware
+from app.api.profiling import ProfilingMiddleware
+from app.api.request_metrics import RequestMetrics, watch_threadpool
+from app.api.responses import APIResponse, ResponseFormatMiddleware
+from app.api.tracing import TracingMiddleware
+from app.api.routes import metrics
 from app.core.config import settings
-from app.db.init_db import init_db
+from app.core.hashing import HashingPoolBusy, password_hasher
+from app.core.memory import memory_tracker
+from app.core.profiling import continuous_profiler, profile_store
+from app.core.tracing import tracer
+from app.db import session as db_session
+from app.db.statement_timeout import DeadlineExceeded
+from app.service.session_service import SessionSweeper
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
     return f"{route.tags[0]}-{route.name}"
 
 
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    generate_unique_id_function=custom_generate_unique_id,
-)
-
-# Set all CORS enabled origins
-if settings.all_cors_origins:
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=settings.all_cors_origins,
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+async def hashing_pool_busy_handler(request: Request, exc: HashingPoolBusy) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication is temporarily overloaded, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded) -> JSONResponse:
+    if exc.cancelled:
+        return JSONResponse(status_code=504, content={"detail": "The request took too long and was cancelled"})
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "The server is busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
+def _init_sentry() -> None:
+    if not settings.SENTRY_DSN:
+        return
+    import sentry_sdk  # imported on demand, it is slow to import
+
+    sentry_sdk.init(dsn=settings.SENTRY_DSN, traces_sample_rate=settings.SENTRY_TRACES_SAMPLE_RATE)
+
+
+async def _dispose_engines() -> None:
+    db_session.engine.dispose()
+    if db_session.async_engine is not None:
+        await db_session.async_engine.dispose()
+    for replica in db_session.read_router.replicas:
+        replica.engine.dispose()
+        if replica.async_engine is not None:
+            await replica.async_engine.dispose()
+
+
+def create_app() -> FastAPI:
+    _init_sentry()
+    session_sweeper = SessionSweeper(
+        db_session.engine,
+        interval=settings.REFRESH_SESSION_SWEEP_INTERVAL_SECONDS,
+        batch_size=settings.REFRESH_SESSION_SWEEP_BATCH_SIZE,
     )
 
-app.include_router(api_router, prefix=settings.API_V1_STR)
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        session_sweeper.start()
+        watch_threadpool()
+        if settings.PROFILING_CONTINUOUS_INTERVAL_SECONDS > 0:
+            continuous_profiler.start()
+        if settings.MEMORY_TRACKING_ENABLED:
+            memory_tracker.start()
+        yield
+        continuous_profiler.stop()
+        if memory_tracker.running:
+            memory_tracker.stop()
+        session_sweeper.stop()
+        password_hasher.shutdown()
+        tracer.shutdown()
+        # aiosqlite keeps a worker thread per pooled connection
+        await _dispose_engines()
+
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        openapi_url=f"{settings.API_V1_STR}/openapi.json",
+        generate_unique_id_function=custom_generate_unique_id,
+        default_response_class=APIResponse,
+        lifespan=lifespan,
+    )
+
+    # JSON or MessagePack, as the Accept header prefers
+    app.add_middleware(ResponseFormatMiddleware)
+
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+            levels=settings.COMPRESSION_LEVELS,
+            route_levels=settings.COMPRESSION_ROUTE_LEVELS,
+            cache_size=settings.COMPRESSION_CACHE_SIZE,
+        )
+
+    # Shed load per route class before requests reach the threadpool and the
+    # database pool; added before CORS so rejections still carry CORS headers
+    if settings.ADMISSION_CONTROL_ENABLED:
+        app.add_middleware(AdmissionControl, classes=[
+            RouteClass(
+                "auth",
+                concurrency=settings.ADMISSION_AUTH_CONCURRENCY,
+                queue_limit=settings.ADMISSION_AUTH_QUEUE,
+                queue_timeout=settings.ADMISSION_AUTH_QUEUE_SECONDS,
+                prefixes=(f"{settings.API_V1_STR}/auth",),
+            ),
+            RouteClass(
+                "batch",
+                concurrency=settings.ADMISSION_BATCH_CONCURRENCY,
+                queue_limit=settings.ADMISSION_BATCH_QUEUE,
+                queue_timeout=settings.ADMISSION_BATCH_QUEUE_SECONDS,
+                prefixes=(f"{settings.API_V1_STR}/batch",),
+            ),
+            RouteClass(
+                "write",
+                concurrency=settings.ADMISSION_WRITE_CONCURRENCY,
+                queue_limit=settings.ADMISSION_WRITE_QUEUE,
+                queue_timeout=settings.ADMISSION_WRITE_QUEUE_SECONDS,
+                methods=("POST", "PUT", "PATCH", "DELETE"),
+            ),
+            RouteClass(
+                "catalog",
+                concurrency=settings.ADMISSION_CATALOG_CONCURRENCY,
+                queue_limit=settings.ADMISSION_CATALOG_QUEUE,
+                queue_timeout=settings.ADMISSION_CATALOG_QUEUE_SECONDS,
+                prefixes=tuple(
+                    f"{settings.API_V1_STR}/{prefix}" for prefix in ("books", "home", "reviews", "categories", "authors")
+                ),
+                methods=("GET", "HEAD"),
+            ),
+        ])
+
+    # Per-route allocation peaks while memory tracking is on
+    app.add_middleware(AllocationMiddleware, tracker=memory_tracker)
+
+    # Admin opt-in profiling of single requests (X-Profile: 1 or ?profile=1)
+    if settings.PROFILING_ENABLED:
+        app.add_middleware(
+            ProfilingMiddleware,
+            interval=settings.PROFILING_SAMPLE_INTERVAL_SECONDS,
+            store=profile_store,
+        )
+
+    # Root span per sampled request; service and SQL spans nest under it
+    if tracer.enabled:
+        app.add_middleware(TracingMiddleware, tracer=tracer)
+
+    # Outermost, so latency includes queueing and shed requests are counted
+    app.add_middleware(RequestMetrics)
+
+    # Set all CORS enabled origins
+    if settings.all_cors_origins:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=settings.all_cors_origins,
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+
+    app.add_exception_handler(HashingPoolBusy, hashing_pool_busy_handler)
+    app.add_exception_handler(DeadlineExceeded, deadline_exceeded_handler)
+    app.include_router(api_router, prefix=settings.API_V1_STR)
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics.router)
+    return app
+
+
+def __getattr__(name: str):
+    # ``app.main:app`` for uvicorn and existing imports, built once on first use
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,44 @@
+"""add refresh session table
+
+Revision ID: 5b7c2e91d4a3
+Revises: 132614894e13
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7c2e91d4a3'
+down_revision: Union[str, None] = '132614894e13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('refresh_session',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('token_hash', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('device', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_refresh_session_token_hash'), 'refresh_session', ['token_hash'], unique=True)
+    op.create_index(op.f('ix_refresh_session_user_id'), 'refresh_session', ['user_id'], unique=False)
+    op.create_index(op.f('ix_refresh_session_expires_at'), 'refresh_session', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_refresh_session_expires_at'), table_name='refresh_session')
+    op.drop_index(op.f('ix_refresh_session_user_id'), table_name='refresh_session')
+    op.drop_index(op.f('ix_refresh_session_token_hash'), table_name='refresh_session')
+    op.drop_table('refresh_session')
@@ -0,0 +1,28 @@
+"""add token version to user
+
+Revision ID: e3a9d5b17c60
+Revises: 8d41c6f0a2b7
+Create Date: 2026-10-19 16:41:08.203517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9d5b17c60'
+down_revision: Union[str, None] = '8d41c6f0a2b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user', 'token_version')
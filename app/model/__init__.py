@@ -7,6 +7,7 @@ from .book import Book
 from .review import Review
 from .discount import Discount
 from .order import Order, OrderItem
+from .refresh_session import RefreshSession
 
 # You can optionally define __all__ to control wildcard imports
 __all__ = [
@@ -18,4 +19,5 @@ __all__ = [
     "Discount",
     "Order",
     "OrderItem",
+    "RefreshSession",
 ]
\ No newline at end of file
@@ -3,6 +3,7 @@ from datetime import date
 from decimal import Decimal
 from typing import Optional, TYPE_CHECKING
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -10,6 +11,13 @@ if TYPE_CHECKING:
 
 
 class Discount(SQLModel, table=True):
+    __table_args__ = (
+        # Covers the active discount lookup per book (price included)
+        Index(
+            "ix_discount_book_id_dates_price",
+            "book_id", "discount_start_date", "discount_end_date", "discount_price",
+        ),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     book_id: int = Field(foreign_key="book.id", index=True)
     discount_start_date: date
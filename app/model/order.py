@@ -3,7 +3,7 @@ from decimal import Decimal
 from typing import Optional, List, TYPE_CHECKING
 
 from pydantic.v1 import validator
-from sqlalchemy import Column, DateTime, func
+from sqlalchemy import Column, DateTime, Index, func
 from sqlmodel import SQLModel, Field, Relationship
 
 from app.model.order_item import OrderItem
@@ -14,6 +14,8 @@ if TYPE_CHECKING:
 
 
 class Order(SQLModel, table=True):
+    # A user's orders, newest first
+    __table_args__ = (Index("ix_order_user_id_order_date", "user_id", "order_date"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id", index=True)
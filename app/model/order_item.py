@@ -1,7 +1,7 @@
 from decimal import Decimal
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import Column, Numeric
+from sqlalchemy import Column, Index, Numeric
 from sqlmodel import SQLModel, Field, Relationship
 
 if TYPE_CHECKING:
@@ -11,6 +11,8 @@ if TYPE_CHECKING:
 class OrderItem(SQLModel, table=True):
     """Represents the order_item table"""
     __tablename__ = "order_item"
+    # Purchase check for reviews: order items of a book, then their orders
+    __table_args__ = (Index("ix_order_item_book_id_order_id", "book_id", "order_id"),)
     id: Optional[int] = Field(default=None, primary_key=True)
     order_id: int = Field(foreign_key="order.id", index=True)
     book_id: int = Field(foreign_key="book.id", index=True)
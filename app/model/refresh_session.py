@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class RefreshSession(SQLModel, table=True):
+    """One row per logged-in device, looked up by the hash of its refresh token"""
+    __tablename__ = "refresh_session"
+    id: Optional[int] = Field(default=None, primary_key=True)
+    token_hash: str = Field(max_length=64, unique=True, index=True)
+    user_id: int = Field(foreign_key="user.id", index=True, ondelete="CASCADE")
+    device: Optional[str] = Field(default=None, max_length=255)
+    created_at: datetime
+    expires_at: datetime = Field(index=True)
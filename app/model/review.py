@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import func
+from sqlalchemy import Index, func
 from sqlmodel import Field, Relationship, SQLModel, Column, DateTime
 
 from app.model.book import Book
@@ -19,6 +19,8 @@ class BaseReview(SQLModel):
     rating_start: int
 
 class Review(BaseReview, table=True):
+    # Covers per-book review counts, averages and star distribution
+    __table_args__ = (Index("ix_review_book_id_rating_start", "book_id", "rating_start"),)
     id: Optional[int] = Field(default=None, primary_key=True)
     book_id: int = Field(foreign_key="book.id", index=True)
     
@@ -14,6 +14,8 @@ class User(BaseUser, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     password: str
     refresh_token : str | None
+    # Security version signed into claims-mode access tokens; incremented to revoke them
+    token_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     orders: list["Order"] = Relationship(back_populates="user")
 
 
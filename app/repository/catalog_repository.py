@@ -0,0 +1,265 @@
+"""
+Lightweight read path for catalog listings.
+
+The service functions load ORM instances (identity map, relationship
+loaders), wrap them in SQLModel response objects and let FastAPI validate
+the result again on the way out. The functions here run the same queries as
+Core selects and map the returned tuples straight into JSON-ready dicts with
+the exact shape of the response models, so a route can return them in an
+``APIResponse`` and skip hydration and validation altogether.
+
+Statement builders are shared with the services, so filtering, sorting and
+pagination cannot drift between the two paths. Each reader has a sync and an
+async variant for use with ``app.db.session.run_read``.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable
+
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.tracing import traced
+from app.model import Author, Book, Category, Review
+from app.schema.book import BookListRequest
+from app.schema.review import ReviewRequest
+from app.service import book_service, review_service
+
+_BOOK_FIELDS = tuple(Book.model_fields)
+_REVIEW_FIELDS = tuple(Review.model_fields)
+_AUTHOR_FIELDS = tuple(Author.model_fields)
+_CATEGORY_FIELDS = tuple(Category.model_fields)
+
+_LISTING_COLUMNS = ("final_price", "discount_amount", "review_count", "avg_rating")
+
+# Column-only variant of the cached listing statement, per query shape
+_row_statement_cache = TTLCache("book_row_statement", maxsize=128, ttl=float("inf"))
+
+
+def _json_value(value: Any) -> Any:
+    """Encode a column value the way the response models serialize it."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _record(fields: tuple[str, ...], row: Iterable[Any]) -> dict[str, Any]:
+    return {field: _json_value(value) for field, value in zip(fields, row)}
+
+
+def _book_rows_statement(req: BookListRequest):
+    shape = book_service._query_shape(req)
+    statement = _row_statement_cache.get(shape)
+    if statement is None:
+        query = book_service._build_books_query(req)
+        columns = [Book.__table__.c[field] for field in _BOOK_FIELDS]
+        columns += [query.selected_columns[name] for name in _LISTING_COLUMNS]
+        statement = book_service._paginated(query.with_only_columns(*columns))
+        _row_statement_cache.set(shape, statement)
+    return statement
+
+
+def _name_statements(rows):
+    author_ids = {row.author_id for row in rows}
+    category_ids = {row.category_id for row in rows}
+    return (
+        select(Author.id, Author.author_name).where(Author.id.in_(author_ids)),
+        select(Category.id, Category.category_name).where(Category.id.in_(category_ids)),
+    )
+
+
+def _book_list_record(rows, total, req: BookListRequest, params, author_names, category_names) -> dict:
+    books = []
+    book_width = len(_BOOK_FIELDS)
+    for row in rows:
+        final_price, discount_amount, review_count, avg_rating = row[book_width:book_width + len(_LISTING_COLUMNS)]
+        books.append({
+            "book": _record(_BOOK_FIELDS, row[:book_width]),
+            "final_price": _json_value(final_price),
+            "discount_amount": _json_value(discount_amount),
+            "avg_rating": float(avg_rating) if avg_rating is not None else None,
+            "review_count": review_count,
+            "author_name": author_names.get(row.author_id),
+            "category_name": category_names.get(row.category_id),
+        })
+
+    offset = params["offset"]
+    return {
+        "count": total,
+        "current_page": req.page,
+        "items_per_page": req.items_per_page,
+        "total_pages": (total + req.items_per_page - 1) // req.items_per_page if total else 0,
+        "start_item": offset + 1 if total else 0,
+        "end_item": min(offset + req.items_per_page, total),
+        "books": books,
+    }
+
+
+@traced()
+def list_books(*, session: Session, req: BookListRequest) -> dict:
+    """Core read path equivalent of ``book_service.get_books``."""
+    _, count_stmt = book_service._book_list_statements(req)
+    params = book_service._book_list_params(req)
+
+    total = session.exec(count_stmt, params=params).one()
+    rows = session.exec(_book_rows_statement(req), params=params).all()
+
+    author_names, category_names = {}, {}
+    if rows:
+        author_stmt, category_stmt = _name_statements(rows)
+        author_names = dict(session.exec(author_stmt).all())
+        category_names = dict(session.exec(category_stmt).all())
+
+    return _book_list_record(rows, total, req, params, author_names, category_names)
+
+
+@traced()
+async def list_books_async(*, session: AsyncSession, req: BookListRequest) -> dict:
+    """Async variant of list_books."""
+    _, count_stmt = book_service._book_list_statements(req)
+    params = book_service._book_list_params(req)
+
+    total = (await session.exec(count_stmt, params=params)).one()
+    rows = (await session.exec(_book_rows_statement(req), params=params)).all()
+
+    author_names, category_names = {}, {}
+    if rows:
+        author_stmt, category_stmt = _name_statements(rows)
+        author_names = dict((await session.exec(author_stmt)).all())
+        category_names = dict((await session.exec(category_stmt)).all())
+
+    return _book_list_record(rows, total, req, params, author_names, category_names)
+
+
+def _home_rows_statement():
+    statement = _row_statement_cache.get("home")
+    if statement is None:
+        ranked, selected = book_service._home_ranked()
+        columns = [Book.__table__.c[field] for field in _BOOK_FIELDS]
+        columns += [ranked.c[name] for name in _LISTING_COLUMNS]
+        columns += [ranked.c[f"{name}_{column}"] for name in book_service.HOME_LISTS for column in ("rank", "total")]
+        statement = select(*columns).join(ranked, Book.id == ranked.c.book_id).where(selected)
+        _row_statement_cache.set("home", statement)
+    return statement
+
+
+def _home_record(rows, author_names, category_names) -> dict:
+    return {
+        name: _book_list_record(members, total, book_service.HOME_LISTS[name], {"offset": 0}, author_names, category_names)
+        for name, (members, total) in book_service.split_home_rows(rows).items()
+    }
+
+
+@traced()
+def home(*, session: Session) -> dict:
+    """Core read path equivalent of ``book_service.get_home``."""
+    rows = session.exec(_home_rows_statement(), params=book_service._home_params()).all()
+
+    author_names, category_names = {}, {}
+    if rows:
+        author_stmt, category_stmt = _name_statements(rows)
+        author_names = dict(session.exec(author_stmt).all())
+        category_names = dict(session.exec(category_stmt).all())
+
+    return _home_record(rows, author_names, category_names)
+
+
+@traced()
+async def home_async(*, session: AsyncSession) -> dict:
+    """Async variant of home."""
+    rows = (await session.exec(_home_rows_statement(), params=book_service._home_params())).all()
+
+    author_names, category_names = {}, {}
+    if rows:
+        author_stmt, category_stmt = _name_statements(rows)
+        author_names = dict((await session.exec(author_stmt)).all())
+        category_names = dict((await session.exec(category_stmt)).all())
+
+    return _home_record(rows, author_names, category_names)
+
+
+def _review_rows_statement(book_id: int, req: ReviewRequest):
+    columns = [Review.__table__.c[field] for field in _REVIEW_FIELDS]
+    return review_service._build_base_review_query(book_id, req, columns)
+
+
+def _review_list_record(rows, total_count, offset, total_pages, req: ReviewRequest, distribution, stats) -> dict:
+    start_item, end_item = review_service._prepare_pagination_info(total_count, offset, req)
+    star_counts = review_service._count_stars(distribution)
+    avg_rating, total_reviews = review_service._parse_review_stats(stats)
+    return {
+        "count": total_count,
+        "current_page": req.page,
+        "items_per_page": req.items_per_page,
+        "total_pages": total_pages,
+        "start_item": start_item,
+        "end_item": end_item,
+        "avg_rating": avg_rating,
+        "reviews_count": total_reviews,
+        "five_stars": star_counts[5],
+        "four_stars": star_counts[4],
+        "three_stars": star_counts[3],
+        "two_stars": star_counts[2],
+        "one_stars": star_counts[1],
+        "reviews": [_record(_REVIEW_FIELDS, row) for row in rows],
+    }
+
+
+@traced()
+def list_reviews(*, session: Session, book_id: int, req: ReviewRequest) -> dict:
+    """Core read path equivalent of ``review_service.get_reviews_for_book``."""
+    query = _review_rows_statement(book_id, req)
+    total_count = session.exec(review_service._count_query(query)).one()
+    query, total_count, offset, total_pages = review_service._paginate(query, total_count, req)
+
+    rows = session.exec(query).all()
+    distribution = session.exec(review_service._star_distribution_query(book_id)).all()
+    stats = session.exec(review_service._review_stats_query(book_id)).first()
+
+    return _review_list_record(rows, total_count, offset, total_pages, req, distribution, stats)
+
+
+@traced()
+async def list_reviews_async(*, session: AsyncSession, book_id: int, req: ReviewRequest) -> dict:
+    """Async variant of list_reviews."""
+    query = _review_rows_statement(book_id, req)
+    total_count = (await session.exec(review_service._count_query(query))).one()
+    query, total_count, offset, total_pages = review_service._paginate(query, total_count, req)
+
+    rows = (await session.exec(query)).all()
+    distribution = (await session.exec(review_service._star_distribution_query(book_id))).all()
+    stats = (await session.exec(review_service._review_stats_query(book_id))).first()
+
+    return _review_list_record(rows, total_count, offset, total_pages, req, distribution, stats)
+
+
+def _all_statement(model, fields: tuple[str, ...], order_by):
+    return select(*[model.__table__.c[field] for field in fields]).order_by(order_by)
+
+
+@traced()
+def list_authors(*, session: Session) -> list[dict]:
+    rows = session.exec(_all_statement(Author, _AUTHOR_FIELDS, Author.author_name)).all()
+    return [_record(_AUTHOR_FIELDS, row) for row in rows]
+
+
+@traced()
+async def list_authors_async(*, session: AsyncSession) -> list[dict]:
+    rows = (await session.exec(_all_statement(Author, _AUTHOR_FIELDS, Author.author_name))).all()
+    return [_record(_AUTHOR_FIELDS, row) for row in rows]
+
+
+@traced()
+def list_categories(*, session: Session) -> list[dict]:
+    rows = session.exec(_all_statement(Category, _CATEGORY_FIELDS, Category.category_name)).all()
+    return [_record(_CATEGORY_FIELDS, row) for row in rows]
+
+
+@traced()
+async def list_categories_async(*, session: AsyncSession) -> list[dict]:
+    rows = (await session.exec(_all_statement(Category, _CATEGORY_FIELDS, Category.category_name))).all()
+    return [_record(_CATEGORY_FIELDS, row) for row in rows]
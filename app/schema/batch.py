@@ -0,0 +1,30 @@
+from typing import Any, Dict, List
+
+from pydantic import field_validator
+from sqlmodel import Field, SQLModel
+
+from app.core.config import settings
+
+
+class BatchItem(SQLModel):
+    path: str = Field(..., description="GET request below the API prefix, with its query string (e.g. /reviews/1?page=2)")
+
+    @field_validator('path')
+    def validate_path(cls, v: str) -> str:
+        if not v.startswith("/") or v.startswith("//"):
+            raise ValueError("Path must be absolute below the API prefix, e.g. /books/1")
+        return v
+
+
+class BatchRequest(SQLModel):
+    requests: List[BatchItem] = Field(..., min_length=1, max_length=settings.BATCH_MAX_REQUESTS)
+
+
+class BatchResult(SQLModel):
+    status: int
+    headers: Dict[str, str] = {}
+    body: Any = None
+
+
+class BatchResponse(SQLModel):
+    responses: List[BatchResult]
@@ -48,3 +48,7 @@ class BookInfo(SQLModel):
 class BookListResponse(BasePagination):
     books: List[BookInfo]
 
+class HomeResponse(SQLModel):
+    on_sale: BookListResponse
+    recommended: BookListResponse
+    popular: BookListResponse
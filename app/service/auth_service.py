@@ -5,19 +5,23 @@ import jwt
 from fastapi import HTTPException, Response, status
 from pydantic import ValidationError
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core import security
 from app.core.config import settings
+from app.core.tracing import traced
 from app.model.user import User
 from app.schema.token import Token, TokenPayload
-from app.service import user_service
+from app.service import session_service, user_service
 
 
-def login_user(
+@traced()
+async def login_user(
     response: Response,
     session: Session,
     email: str,
-    password: str
+    password: str,
+    device: str | None = None
 ) -> Token:
     """
     Authenticate user and return access token with refresh token in cookie.
@@ -27,6 +31,7 @@ def login_user(
         session: Database session
         email: User email
         password: User password
+        device: Client description (User-Agent) stored with the session
         
     Returns:
         Token: Access token for API authentication
@@ -34,30 +39,34 @@ def login_user(
     Raises:
         HTTPException: If credentials are invalid
     """
-    user = user_service.authenticate(
+    # Password verification waits on the event loop; only the database
+    # work below takes a threadpool worker
+    user = await user_service.authenticate(
         session=session, email=email, password=password
     )
     if not user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect email or password")
+    return await run_in_threadpool(_issue_tokens, response, session, user, device)
 
+
+def _issue_tokens(response: Response, session: Session, user: User, device: str | None) -> Token:
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     refresh_token_expires = timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
 
-    access_token = security.create_access_token(
-        user.id,
-        expires_delta=access_token_expires
-    )
+    access_token = create_user_access_token(user, expires_delta=access_token_expires)
 
     refresh_token = security.create_refresh_token(
         user.id,
         expires_delta=refresh_token_expires
     )
 
-    # Store the HASHED refresh token in the database
-    user_service.update_refresh_token(
+    # Store the HASHED refresh token as a new session for this device
+    session_service.create_session(
         session=session,
-        user=user,
-        refresh_token=refresh_token
+        user_id=user.id,
+        refresh_token=refresh_token,
+        expires_delta=refresh_token_expires,
+        device=device
     )
 
     # Set raw refresh token in HttpOnly cookie using settings from config
@@ -70,6 +79,31 @@ def login_user(
     return Token(access_token=access_token)
 
 
+def create_user_access_token(user: User, expires_delta: timedelta) -> str:
+    """
+    Create an access token for a user.
+
+    When ``ACCESS_TOKEN_EMBED_CLAIMS`` is enabled the admin flag, email and the
+    user's current security version are signed into the token so dependencies
+    can build a principal without loading the user.
+
+    Args:
+        user: User the token is issued to
+        expires_delta: Token lifetime
+
+    Returns:
+        str: Encoded JWT
+    """
+    claims = None
+    if settings.ACCESS_TOKEN_EMBED_CLAIMS:
+        claims = {
+            "adm": user.admin,
+            "email": user.email,
+            "ver": user.token_version,
+        }
+    return security.create_access_token(user.id, expires_delta=expires_delta, claims=claims)
+
+
 def set_refresh_token_cookie(
     response: Response, 
     refresh_token: str, 
@@ -136,17 +170,14 @@ def refresh_access_token(
             delete_refresh_token_cookie(response)
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token has expired")
 
-        user_id = int(token_data.sub)
-        user = session.get(User, user_id)
+        user = session_service.get_session_user(session=session, refresh_token=refresh_token)
 
-        if not user or not user.refresh_token or not security.verify_token(refresh_token, user.refresh_token):
+        if not user or user.id != int(token_data.sub):
             delete_refresh_token_cookie(response)
             raise credentials_exception
 
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        new_access_token = security.create_access_token(
-            subject=user.id, expires_delta=access_token_expires
-        )
+        new_access_token = create_user_access_token(user, expires_delta=access_token_expires)
         return Token(access_token=new_access_token)
 
     except (jwt.InvalidTokenError, ValidationError, ValueError):
@@ -178,10 +209,11 @@ def logout_user(
             )
             user_id_str = payload.get("sub")
             if user_id_str:
-                user = session.get(User, int(user_id_str))
-                if user and user.refresh_token:
-                    if security.verify_token(refresh_token, user.refresh_token):
-                        user_service.clear_refresh_token(session=session, user=user)
+                # Only this device's session is revoked; other devices stay logged in
+                session_service.revoke_session(session=session, refresh_token=refresh_token)
+                # Access tokens are revoked globally only on password change
+                # and account deletion, so keep this device's logout local
+                user_service.invalidate_user(int(user_id_str), session=session, revoke_tokens=False)
         except (jwt.InvalidTokenError, ValueError):
             pass
 
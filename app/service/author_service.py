@@ -1,6 +1,7 @@
 from typing import List
 
 from sqlmodel import  select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.dependencies import SessionDep
 from app.model.author import Author
@@ -9,4 +10,10 @@ from app.model.author import Author
 def get_authors(session: SessionDep) -> List[Author]:
     query = select(Author).order_by(Author.author_name)
     result = session.exec(query).all()
-    return result
\ No newline at end of file
+    return result
+
+
+async def get_authors_async(session: AsyncSession) -> List[Author]:
+    query = select(Author).order_by(Author.author_name)
+    result = (await session.exec(query)).all()
+    return result
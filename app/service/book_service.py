@@ -3,16 +3,25 @@ import datetime
 
 from fastapi import HTTPException, status
 from sqlmodel import desc, asc, func, text, select, or_, and_, literal_column, null
-from sqlalchemy.orm import aliased
+from sqlalchemy import Date, Integer, String, bindparam, case
+from sqlalchemy.orm import aliased, selectinload
 from sqlalchemy.sql.operators import is_
 
 from sqlmodel import Session # Keep this for SessionDep typing if needed
-from werkzeug.exceptions import NotFound
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.dependencies import SessionDep
+from app.core.cache import TTLCache
+from app.core.tracing import traced
 from app.model import Book, Author, Category, Review, Discount
-from app.schema.book import BookListRequest, BookListResponse, BookInfo
-from app.util.currency_change import get_currency_info
+from app.schema.book import BookListRequest, BookListResponse, BookInfo, HomeResponse
+
+# Listing statements per query shape (sort, which filters are present). Values
+# that vary between requests are bound parameters, so one statement object is
+# built per shape and reused; the SQL text is identical for every request of a
+# shape, which also lets psycopg prepare it server side. There are only a few
+# dozen shapes, so entries never expire.
+_statement_cache = TTLCache("book_list_statement", maxsize=128, ttl=float("inf"))
 
 
 def _build_discount_price_subquery(today):
@@ -71,19 +80,27 @@ def _build_base_query(discount_price_sq, today):
     )
 
 
+def _has_rating_filter(req) -> bool:
+    return req.min_rating is not None or req.sort_by == "recommend"
+
+
 def _apply_filters(query, req):
-    """Apply filters to the query."""
+    """Apply filters to the query; filter values are left as bound parameters."""
     # Rating filter
-    if req.min_rating is not None or req.sort_by == "recommend":
-        min_rating = 1 if req.min_rating is None else req.min_rating
+    if _has_rating_filter(req):
+        min_rating = bindparam("min_rating", type_=Integer)
         query = query.where(func.coalesce(query.selected_columns.avg_rating, 0) >= min_rating)
     # Category filter
     if req.category_name:
-        query = query.join(Category).where(Category.category_name == req.category_name)
+        query = query.join(Category).where(
+            Category.category_name == bindparam("category_name", type_=String)
+        )
 
     # Author filter
     if req.author_name:
-        query = query.join(Author).where(Author.author_name == req.author_name)
+        query = query.join(Author).where(
+            Author.author_name == bindparam("author_name", type_=String)
+        )
     
     return query
 
@@ -111,18 +128,16 @@ def _apply_sorting(query, req, final_price, discount_amount):
     return query
 
 
-def _apply_pagination(query, req, session):
-    """Apply pagination to the query and get count."""
-    # Get total count for pagination
-    count_query = select(func.count()).select_from(query.subquery())
-    total = session.exec(count_query).one()
+def _count_query(query):
+    """Build the total count query for a listing query."""
+    return select(func.count()).select_from(query.subquery())
+
 
-    # Apply pagination
+def _page_bounds(req):
+    """Return the offset and limit for the requested page."""
     offset = (req.page - 1) * req.items_per_page
     limit = req.limit if req.limit else req.items_per_page
-    query = query.offset(offset).limit(limit)
-    
-    return query, total, offset
+    return offset, limit
 
 
 def _process_results(rows):
@@ -144,11 +159,9 @@ def _process_results(rows):
     return books_with_prices
 
 
-def get_books(*, session : SessionDep, req: BookListRequest) -> BookListResponse:
-    """
-    Fetches a paginated list of books with filtering, sorting, and pagination.
-    """
-    today = datetime.date.today()
+def _build_books_query(req: BookListRequest):
+    """Build the full listing query (filters and sorting, no pagination)."""
+    today = bindparam("today", type_=Date)
     
     # 1. Build discount subquery
     discount_price_sq = _build_discount_price_subquery(today)
@@ -162,18 +175,53 @@ def get_books(*, session : SessionDep, req: BookListRequest) -> BookListResponse
     # 4. Apply sorting
     final_price = func.coalesce(discount_price_sq, Book.book_price)
     discount_amount = (Book.book_price - final_price)
-    query = _apply_sorting(query, req, final_price, discount_amount)
-    
-    # 5. Apply pagination and get count
-    query, total, offset = _apply_pagination(query, req, session)
-    
-    # 6. Execute query
-    rows = session.exec(query).all()
-    
-    # 7. Process results
+    return _apply_sorting(query, req, final_price, discount_amount)
+
+
+def _query_shape(req: BookListRequest) -> tuple:
+    return (
+        req.sort_by or "on_sale",
+        _has_rating_filter(req),
+        bool(req.category_name),
+        bool(req.author_name),
+    )
+
+
+def _paginated(query):
+    """Apply offset and limit as bound parameters (see _book_list_params)."""
+    return query.offset(bindparam("offset", type_=Integer)).limit(bindparam("limit", type_=Integer))
+
+
+def _book_list_statements(req: BookListRequest):
+    """Return the cached (page, count) statements for the request's query shape."""
+    shape = _query_shape(req)
+    statements = _statement_cache.get(shape)
+    if statements is None:
+        # Load authors and categories up front: lazy loads are N+1 on the sync
+        # path and not allowed at all on the async one
+        query = _build_books_query(req).options(selectinload(Book.author), selectinload(Book.category))
+        statements = (_paginated(query), _count_query(query))
+        _statement_cache.set(shape, statements)
+    return statements
+
+
+def _book_list_params(req: BookListRequest) -> dict:
+    """Bound parameter values for the request, matching its query shape."""
+    offset, limit = _page_bounds(req)
+    params = {"today": datetime.date.today(), "offset": offset, "limit": limit}
+    if _has_rating_filter(req):
+        params["min_rating"] = 1 if req.min_rating is None else req.min_rating
+    if req.category_name:
+        params["category_name"] = req.category_name
+    if req.author_name:
+        params["author_name"] = req.author_name
+    return params
+
+
+def _build_list_response(rows, total, offset, req: BookListRequest) -> BookListResponse:
+    """Wrap result rows and pagination info in a BookListResponse."""
     books_with_prices = _process_results(rows)
 
-    # 8. Prepare pagination info
     total_pages = (total + req.items_per_page - 1) // req.items_per_page if total else 0
     start_item = offset + 1 if total else 0
     end_item = min(offset + req.items_per_page, total)
@@ -188,21 +236,54 @@ def get_books(*, session : SessionDep, req: BookListRequest) -> BookListResponse
         end_item=end_item,
     )
 
-def get_book(*, session: SessionDep, book_id: int,) -> BookInfo:
-    today = datetime.date.today()
-    
-    # First, get the book
-    book_stmt = select(Book).where(Book.id == book_id)
-    book = session.exec(book_stmt).first()
-    
-    if book is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Book not found"
-        )
+
+@traced()
+def get_books(*, session : SessionDep, req: BookListRequest) -> BookListResponse:
+    """
+    Fetches a paginated list of books with filtering, sorting, and pagination.
+    """
+    page_stmt, count_stmt = _book_list_statements(req)
+    params = _book_list_params(req)
+
+    # 5. Get total count for pagination
+    total = session.exec(count_stmt, params=params).one()
+
+    # 6. Execute query
+    rows = session.exec(page_stmt, params=params).all()
+
+    # 7. Process results and pagination info
+    return _build_list_response(rows, total, params["offset"], req)
+
+
+@traced()
+async def get_books_async(*, session: AsyncSession, req: BookListRequest) -> BookListResponse:
+    """
+    Async variant of get_books for the native asyncio read path.
+    """
+    page_stmt, count_stmt = _book_list_statements(req)
+    params = _book_list_params(req)
+
+    total = (await session.exec(count_stmt, params=params)).one()
+    rows = (await session.exec(page_stmt, params=params)).all()
+
+    return _build_list_response(rows, total, params["offset"], req)
+
+
+# Built once: a fresh alias per request registers schema events for its
+# columns that outlive the request
+_detail_discount = aliased(Discount)
+
+
+def _book_detail_statements(book_id: int, today):
+    """Build the book, active discount, average rating and review count statements."""
+    book_stmt = (
+        select(Book)
+        .where(Book.id == book_id)
+        .options(selectinload(Book.author), selectinload(Book.category))
+    )
 
     # Get the active discount price if any
-    ActiveDiscount = aliased(Discount)
+    ActiveDiscount = _detail_discount
     discount_stmt = (
         select(ActiveDiscount.discount_price)
         .where(
@@ -217,22 +298,23 @@ def get_book(*, session: SessionDep, book_id: int,) -> BookInfo:
         .limit(1)
     )
     
-    discount_price = session.exec(discount_stmt).first()
-    
     # Get average rating
     avg_rating_stmt = (
         select(func.avg(Review.rating_start))
         .where(Review.book_id == book_id)
     )
-    avg_rating = session.exec(avg_rating_stmt).first()
     
     # Get review count
     review_count_stmt = (
         select(func.count(Review.id))
         .where(Review.book_id == book_id)
     )
-    review_count = session.exec(review_count_stmt).first() or 0
-    
+
+    return book_stmt, discount_stmt, avg_rating_stmt, review_count_stmt
+
+
+def _build_book_info(book, discount_price, avg_rating, review_count) -> BookInfo:
+    """Combine a book with its pricing and rating data."""
     # Calculate final_price and discount_amount correctly
     final_price = discount_price if discount_price is not None else book.book_price
     discount_amount = book.book_price - final_price if discount_price is not None else 0
@@ -243,9 +325,168 @@ def get_book(*, session: SessionDep, book_id: int,) -> BookInfo:
         discount_price=discount_price,
         discount_amount=discount_amount,
         avg_rating=float(avg_rating) if avg_rating is not None else None,
-        review_count=review_count,
+        review_count=review_count or 0,
         author_name=book.author.author_name if book.author else None,
         category_name=book.category.category_name if book.category else None
     )
 
 
+def _book_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Book not found"
+    )
+
+
+@traced()
+def get_book(*, session: SessionDep, book_id: int,) -> BookInfo:
+    today = datetime.date.today()
+    book_stmt, discount_stmt, avg_rating_stmt, review_count_stmt = _book_detail_statements(book_id, today)
+    
+    # First, get the book
+    book = session.exec(book_stmt).first()
+    if book is None:
+        raise _book_not_found()
+
+    discount_price = session.exec(discount_stmt).first()
+    avg_rating = session.exec(avg_rating_stmt).first()
+    review_count = session.exec(review_count_stmt).first()
+
+    return _build_book_info(book, discount_price, avg_rating, review_count)
+
+
+@traced()
+async def get_book_async(*, session: AsyncSession, book_id: int) -> BookInfo:
+    today = datetime.date.today()
+    book_stmt, discount_stmt, avg_rating_stmt, review_count_stmt = _book_detail_statements(book_id, today)
+
+    book = (await session.exec(book_stmt)).first()
+    if book is None:
+        raise _book_not_found()
+
+    discount_price = (await session.exec(discount_stmt)).first()
+    avg_rating = (await session.exec(avg_rating_stmt)).first()
+    review_count = (await session.exec(review_count_stmt)).first()
+
+    return _build_book_info(book, discount_price, avg_rating, review_count)
+
+
+# Featured lists served together by GET /home, with the same sorting, filters
+# and sizes as /books/top-sale, /books/recommend and /books/most_reviews
+HOME_LISTS = {
+    "on_sale": BookListRequest(sort_by="on_sale", limit=10),
+    "recommended": BookListRequest(sort_by="recommend", limit=8),
+    "popular": BookListRequest(sort_by="popularity", limit=8),
+}
+
+
+def _home_ranked():
+    """
+    Per-book prices and ratings computed once, ranked for every home list.
+
+    Each list gets a rank column (NULL for books it filters out) and a total
+    column; a book is selected when it ranks within any list's limit.
+    """
+    today = bindparam("today", type_=Date)
+    query = _build_base_query(_build_discount_price_subquery(today), today)
+    columns = query.selected_columns
+    stats = query.with_only_columns(
+        Book.id.label("book_id"),
+        columns.final_price,
+        columns.discount_price,
+        columns.discount_amount,
+        columns.review_count,
+        columns.avg_rating,
+    ).subquery("book_stats")
+    s = stats.c
+
+    # Same filter and order as _apply_filters/_apply_sorting; book id breaks ties
+    lists = {
+        "on_sale": (s.discount_amount > 0, [desc(s.discount_amount), asc(s.final_price)]),
+        "recommended": (s.avg_rating >= 1, [desc(s.avg_rating), asc(s.final_price)]),
+        "popular": (None, [desc(s.review_count), asc(s.final_price)]),
+    }
+    ranks = []
+    for name, (included, order_by) in lists.items():
+        if included is None:
+            ranks.append(func.row_number().over(order_by=[*order_by, s.book_id]).label(f"{name}_rank"))
+            ranks.append(func.count().over().label(f"{name}_total"))
+            continue
+        # Included books sort first, so they are numbered 1..n
+        rank = func.row_number().over(order_by=[case((included, 0), else_=1), *order_by, s.book_id])
+        ranks.append(case((included, rank)).label(f"{name}_rank"))
+        ranks.append(func.sum(case((included, 1), else_=0)).over().label(f"{name}_total"))
+    ranked = select(*stats.c, *ranks).subquery("ranked")
+
+    selected = or_(*(
+        ranked.c[f"{name}_rank"] <= bindparam(f"{name}_limit", type_=Integer) for name in HOME_LISTS
+    ))
+    return ranked, selected
+
+
+def _home_statement():
+    statement = _statement_cache.get("home")
+    if statement is None:
+        ranked, selected = _home_ranked()
+        r = ranked.c
+        statement = (
+            select(
+                Book,
+                r.final_price,
+                r.discount_price,
+                r.discount_amount,
+                r.review_count,
+                r.avg_rating,
+                *(r[f"{name}_{column}"] for name in HOME_LISTS for column in ("rank", "total")),
+            )
+            .join(ranked, Book.id == r.book_id)
+            .where(selected)
+            .options(selectinload(Book.author), selectinload(Book.category))
+        )
+        _statement_cache.set("home", statement)
+    return statement
+
+
+def _home_params() -> dict:
+    params = {"today": datetime.date.today()}
+    for name, req in HOME_LISTS.items():
+        params[f"{name}_limit"] = req.limit
+    return params
+
+
+def split_home_rows(rows) -> dict[str, tuple[list, int]]:
+    """Rows and total of each home list, in list order."""
+    lists = {}
+    for name in HOME_LISTS:
+        limit = HOME_LISTS[name].limit
+        rank = f"{name}_rank"
+        members = [row for row in rows if getattr(row, rank) is not None and getattr(row, rank) <= limit]
+        members.sort(key=lambda row: getattr(row, rank))
+        total = getattr(rows[0], f"{name}_total") if rows else 0
+        lists[name] = (members, int(total or 0))
+    return lists
+
+
+def _build_home_response(rows) -> HomeResponse:
+    return HomeResponse(**{
+        name: _build_list_response(members, total, 0, HOME_LISTS[name])
+        for name, (members, total) in split_home_rows(rows).items()
+    })
+
+
+@traced()
+def get_home(*, session: SessionDep) -> HomeResponse:
+    """
+    Compute the featured lists of the homepage in one statement.
+    """
+    rows = session.exec(_home_statement(), params=_home_params()).all()
+    return _build_home_response(rows)
+
+
+@traced()
+async def get_home_async(*, session: AsyncSession) -> HomeResponse:
+    """
+    Async variant of get_home for the native asyncio read path.
+    """
+    rows = (await session.exec(_home_statement(), params=_home_params())).all()
+    return _build_home_response(rows)
@@ -1,6 +1,7 @@
 from typing import List
 
 from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.dependencies import SessionDep
 from app.model.category import Category
@@ -9,4 +10,10 @@ from app.model.category import Category
 def get_categories(session : SessionDep) -> List[Category]:
     query = select(Category).order_by(Category.category_name)
     result = session.exec(query).all()
-    return result
\ No newline at end of file
+    return result
+
+
+async def get_categories_async(session: AsyncSession) -> List[Category]:
+    query = select(Category).order_by(Category.category_name)
+    result = (await session.exec(query)).all()
+    return result
@@ -7,6 +7,7 @@ from sqlalchemy.orm import aliased
 from sqlmodel import select, or_, desc
 import math
 from app.api.dependencies import SessionDep
+from app.core.tracing import traced
 from app.model.user import User
 from app.model import Book, Discount, Order, OrderItem
 from app.schema.order import OrderRequest, OrderResponse, Item, OrderErrorType
@@ -143,6 +144,7 @@ def _prepare_response(req_items, book_data, total_amount, current_user: User, va
     return response
 
 
+@traced()
 def place_order(session: SessionDep, req: OrderRequest, current_user: User | BaseUser) -> OrderResponse:
     try:
         today = datetime.now().date()
@@ -6,22 +6,39 @@ from app.model import Order, OrderItem
 from app.model import User
 from sqlalchemy import func, desc, asc
 from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.dependencies import SessionDep
+from app.core.tracing import traced
 from app.model.review import Review, BaseReview
 from app.schema.review import ReviewResponse, ReviewRequest, ReviewCreateRequest
 
 
-def get_star_distribution(session: SessionDep, book_id: int) -> Dict[int, int]:
-    """Get the distribution of star ratings for a book"""
-    query = (
+def _star_distribution_query(book_id: int):
+    return (
         select(Review.rating_start, func.count(Review.id))
         .where(Review.book_id == book_id)
         .group_by(Review.rating_start)
     )
-    
-    results = session.exec(query).all()
-    
+
+
+def _review_stats_query(book_id: int):
+    return (
+        select(
+            func.avg(Review.rating_start).label("avg_rating"),
+            func.count(Review.id).label("total_reviews")
+        )
+        .where(Review.book_id == book_id)
+    )
+
+
+def get_star_distribution(session: SessionDep, book_id: int) -> Dict[int, int]:
+    """Get the distribution of star ratings for a book"""
+    results = session.exec(_star_distribution_query(book_id)).all()
+    return _count_stars(results)
+
+
+def _count_stars(results) -> Dict[int, int]:
     # Initialize counts for all star ratings (1-5)
     star_counts = { i : 0 for i in range(1,6)}
     
@@ -34,25 +51,25 @@ def get_star_distribution(session: SessionDep, book_id: int) -> Dict[int, int]:
 
 def get_review_stats(session: SessionDep, book_id: int) -> Tuple[float, int]:
     """Get average rating and total review count for a book"""
-    query = (
-        select(
-            func.avg(Review.rating_start).label("avg_rating"),
-            func.count(Review.id).label("total_reviews")
-        )
-        .where(Review.book_id == book_id)
-    )
-    
-    result = session.exec(query).first()
+    result = session.exec(_review_stats_query(book_id)).first()
+    return _parse_review_stats(result)
+
+
+def _parse_review_stats(result) -> Tuple[float, int]:
     avg_rating = float(result[0]) if result[0] is not None else 0.0
     total_reviews = result[1] if result[1] is not None else 0
     
     return avg_rating, total_reviews
 
 
-def _build_base_review_query(book_id: int, req: ReviewRequest):
-    """Build the base query for reviews with filters and sorting."""
+def _build_base_review_query(book_id: int, req: ReviewRequest, columns=None):
+    """Build the base query for reviews with filters and sorting.
+
+    Selects Review instances, or only ``columns`` when given.
+    """
     # Base query for reviews
-    query = select(Review).where(Review.book_id == book_id)
+    query = select(*columns) if columns else select(Review)
+    query = query.where(Review.book_id == book_id)
     
     # Apply star filter if specified
     if req.star is not None:
@@ -70,9 +87,16 @@ def _build_base_review_query(book_id: int, req: ReviewRequest):
 def _apply_pagination(session: SessionDep, query, req: ReviewRequest):
     """Apply pagination and get count information."""
     # Get total count for pagination
-    count_query = select(func.count()).select_from(query.subquery())
-    total_count = session.exec(count_query).one()
-    
+    total_count = session.exec(_count_query(query)).one()
+    return _paginate(query, total_count, req)
+
+
+def _count_query(query):
+    return select(func.count()).select_from(query.subquery())
+
+
+def _paginate(query, total_count: int, req: ReviewRequest):
+    """Apply offset and limit once the total count is known."""
     # Calculate pagination
     offset = (req.page - 1) * req.items_per_page
     total_pages = (total_count + req.items_per_page - 1) // req.items_per_page if total_count else 0
@@ -95,6 +119,7 @@ def _prepare_pagination_info(total_count: int, offset: int, req: ReviewRequest):
     return start_item, end_item
 
 
+@traced()
 def get_reviews_for_book(session: SessionDep, book_id: int, req: ReviewRequest) -> ReviewResponse:
     """
     Get reviews for a book with filtering and sorting options.
@@ -116,6 +141,38 @@ def get_reviews_for_book(session: SessionDep, book_id: int, req: ReviewRequest)
     star_counts = get_star_distribution(session, book_id)
     avg_rating, total_reviews = get_review_stats(session, book_id)
     
+    return _build_review_response(
+        reviews, total_count, total_pages, start_item, end_item, req,
+        avg_rating, total_reviews, star_counts
+    )
+
+
+@traced()
+async def get_reviews_for_book_async(session: AsyncSession, book_id: int, req: ReviewRequest) -> ReviewResponse:
+    """
+    Async variant of get_reviews_for_book for the native asyncio read path.
+    """
+    query = _build_base_review_query(book_id, req)
+
+    total_count = (await session.exec(_count_query(query))).one()
+    query, total_count, offset, total_pages = _paginate(query, total_count, req)
+    start_item, end_item = _prepare_pagination_info(total_count, offset, req)
+
+    reviews = (await session.exec(query)).all()
+
+    star_counts = _count_stars((await session.exec(_star_distribution_query(book_id))).all())
+    avg_rating, total_reviews = _parse_review_stats((await session.exec(_review_stats_query(book_id))).first())
+
+    return _build_review_response(
+        reviews, total_count, total_pages, start_item, end_item, req,
+        avg_rating, total_reviews, star_counts
+    )
+
+
+def _build_review_response(
+    reviews, total_count, total_pages, start_item, end_item, req: ReviewRequest,
+    avg_rating, total_reviews, star_counts
+) -> ReviewResponse:
     return ReviewResponse(
         reviews=reviews,
         count=total_count,
@@ -157,6 +214,7 @@ def _check_purchase_eligibility(session: SessionDep, book_id: int, user_id: int)
         )
 
 
+@traced()
 def create_review(book_id: int, user: User, session: SessionDep, req: ReviewCreateRequest) -> BaseReview:
     # Check if user has purchased the book
     _check_purchase_eligibility(session, book_id, user.id)
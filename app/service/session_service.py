@@ -0,0 +1,118 @@
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import hash_token
+from app.model import RefreshSession, User
+
+logger = logging.getLogger(__name__)
+
+# Hashes of refresh tokens revoked by this worker. Checked before the database
+# so a replayed token is rejected without a query; entries only need to live
+# as long as the token itself could.
+revoked_tokens = TTLCache(
+    "revoked_refresh_token",
+    maxsize=settings.REFRESH_REVOCATION_CACHE_SIZE,
+    ttl=settings.REFRESH_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def create_session(
+    *, session: Session, user_id: int, refresh_token: str, expires_delta: timedelta, device: str | None
+) -> RefreshSession:
+    """Store a new refresh session; other devices of the same user are untouched."""
+    now = _utcnow()
+    refresh_session = RefreshSession(
+        token_hash=hash_token(refresh_token),
+        user_id=user_id,
+        device=device[:255] if device else None,
+        created_at=now,
+        expires_at=now + expires_delta,
+    )
+    session.add(refresh_session)
+    session.commit()
+    return refresh_session
+
+
+def get_session_user(*, session: Session, refresh_token: str) -> User | None:
+    """Return the owner of an active refresh session with one indexed read."""
+    token_hash = hash_token(refresh_token)
+    if revoked_tokens.get(token_hash):
+        return None
+
+    statement = (
+        select(User)
+        .join(RefreshSession, RefreshSession.user_id == User.id)
+        .where(RefreshSession.token_hash == token_hash)
+        .where(RefreshSession.expires_at > _utcnow())
+    )
+    return session.exec(statement).first()
+
+
+def revoke_session(*, session: Session, refresh_token: str) -> None:
+    token_hash = hash_token(refresh_token)
+    revoked_tokens.set(token_hash, True)
+    session.exec(delete(RefreshSession).where(RefreshSession.token_hash == token_hash))
+    session.commit()
+
+
+def sweep_expired_sessions(*, session: Session, batch_size: int) -> int:
+    """Delete expired sessions in batches so no single statement holds locks for long."""
+    removed = 0
+    while True:
+        expired_ids = session.exec(
+            select(RefreshSession.id)
+            .where(RefreshSession.expires_at <= _utcnow())
+            .limit(batch_size)
+        ).all()
+        if not expired_ids:
+            return removed
+        session.exec(delete(RefreshSession).where(RefreshSession.id.in_(expired_ids)))
+        session.commit()
+        removed += len(expired_ids)
+        if len(expired_ids) < batch_size:
+            return removed
+
+
+class SessionSweeper:
+    """Background thread that periodically removes expired refresh sessions."""
+
+    def __init__(self, engine, interval: float, batch_size: int):
+        self.engine = engine
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="refresh-session-sweeper", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                with Session(self.engine) as session:
+                    removed = sweep_expired_sessions(session=session, batch_size=self.batch_size)
+                if removed:
+                    logger.info("Swept %d expired refresh sessions", removed)
+            except Exception:
+                logger.exception("Refresh session sweep failed")
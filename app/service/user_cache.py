@@ -0,0 +1,92 @@
+"""
+Cache of authenticated users.
+
+Entries are keyed by user id and the signature of the access token that was
+validated, and hold a column snapshot rather than the ORM instance so that
+each request gets its own object. Invalidation bumps a per-user generation,
+which drops every cached token for that user in O(1). A generation is only
+remembered until every entry cached before it has expired.
+
+The cache is per process and invalidation is not propagated: after a user is
+changed or deleted, other workers may keep serving their cached copy for up
+to ``USER_CACHE_TTL_SECONDS``. Revoked claims-mode tokens are rejected by
+every worker regardless, through ``app.core.token_versions``.
+"""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.model.user import User
+
+
+class UserCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache("authenticated_user", maxsize=maxsize, ttl=ttl)
+        # user id -> (generation, monotonic time of the invalidation), oldest
+        # invalidation first. Generations come from one counter so a user
+        # that is pruned and invalidated again never reuses a number.
+        self._generations: OrderedDict[int, tuple[int, float]] = OrderedDict()
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _token_identity(token: str) -> str:
+        # The signature segment is unique per issued token and free to extract.
+        return token.rpartition(".")[2]
+
+    def get(self, user_id: int, token: str) -> User | None:
+        entry = self._cache.get((user_id, self._token_identity(token)))
+        if entry is None:
+            return None
+        generation, snapshot = entry
+        if generation != self.generation(user_id):
+            return None
+        return self._hydrate(snapshot)
+
+    def generation(self, user_id: int) -> int:
+        entry = self._generations.get(user_id)
+        return entry[0] if entry else 0
+
+    def put(self, user: User, token: str, generation: int) -> None:
+        """Cache ``user`` unless it was invalidated after ``generation`` was read."""
+        if generation != self.generation(user.id):
+            return
+        snapshot: dict[str, Any] = user.model_dump()
+        self._cache.set((user.id, self._token_identity(token)), (generation, snapshot))
+
+    def invalidate(self, user_id: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._generations[user_id] = (next(self._sequence), now)
+            self._generations.move_to_end(user_id)
+            # Entries cached before an invalidation are expired ttl seconds
+            # after it, so its generation no longer needs to be checked
+            while self._generations:
+                _, invalidated_at = next(iter(self._generations.values()))
+                if invalidated_at + self._cache.ttl > now:
+                    break
+                self._generations.popitem(last=False)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    @staticmethod
+    def _hydrate(snapshot: dict[str, Any]) -> User:
+        # A detached (not transient) instance can be attached to the request
+        # session by routes that update or delete the current user.
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return user
+
+
+user_cache = UserCache(
+    maxsize=settings.USER_CACHE_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
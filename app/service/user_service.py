@@ -1,17 +1,32 @@
 
 from typing import Any
 
-from sqlmodel import Session, select
+from sqlmodel import Session, select, update
+from starlette.concurrency import run_in_threadpool
 
-from app.core.security import get_password_hash, verify_password, hash_token
+from app.core.security import get_password_hash, get_password_hash_async, verify_and_update_password_async
 from app.model import User
 from app.schema.user import UserUpdate,UserCreate
+from app.core.token_versions import security_versions
+from app.core.tracing import traced
+from app.service.user_cache import user_cache
 
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
+    return _insert_user(session, user_create, get_password_hash(user_create.password))
+
+
+async def create_user_async(*, session: Session, user_create: UserCreate) -> User:
+    """``create_user`` for request handlers: the hash is awaited on the event
+    loop, only the insert runs in the threadpool."""
+    hashed_password = await get_password_hash_async(user_create.password)
+    return await run_in_threadpool(_insert_user, session, user_create, hashed_password)
+
+
+def _insert_user(session: Session, user_create: UserCreate, hashed_password: str) -> User:
     db_obj = User.model_validate(
         user_create, update={
-        "password": get_password_hash(user_create.password),
+        "password": hashed_password,
                              "refresh_token": None}
 
     )
@@ -31,9 +46,24 @@ def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> Any:
     session.add(db_user)
     session.commit()
     session.refresh(db_user)
+    invalidate_user(db_user.id, session=session)
     return db_user
 
 
+def invalidate_user(user_id: int, *, session: Session, revoke_tokens: bool = True) -> None:
+    """Drop cached copies of the user and, unless told otherwise, revoke its
+    claims-mode access tokens. Call after the user's changes are committed."""
+    user_cache.invalidate(user_id)
+    if revoke_tokens:
+        # Shared by every worker; a deleted user matches no row and its
+        # tokens already fail the check
+        session.execute(
+            update(User).where(User.id == user_id).values(token_version=User.token_version + 1)
+        )
+        session.commit()
+        security_versions.forget(user_id)
+
+
 def get_user_by_email(*, session: Session, email: str) -> User | None:
 
     statement = select(User).where(User.email == email)
@@ -42,26 +72,22 @@ def get_user_by_email(*, session: Session, email: str) -> User | None:
     return session_user
 
 
-def authenticate(*, session: Session, email: str, password: str) -> User | None:
-    db_user = get_user_by_email(session=session, email=email)
+@traced()
+async def authenticate(*, session: Session, email: str, password: str) -> User | None:
+    db_user = await run_in_threadpool(get_user_by_email, session=session, email=email)
 
     if not db_user:
         return None
-    if not verify_password(password, db_user.password):
+    verified, new_hash = await verify_and_update_password_async(password, db_user.password)
+    if not verified:
         return None
+    if new_hash:
+        # Stored hash predates the configured work factor; upgrade it in place.
+        db_user.password = new_hash
+        await run_in_threadpool(_save_user, session, db_user)
     return db_user
 
-def update_refresh_token(*, session: Session, user: User, refresh_token: str) -> None:
-    """Updates the user's hashed refresh token in the database."""
-    user.refresh_token = hash_token(refresh_token)
-    session.add(user)
-    session.commit()
-    session.refresh(user) # Refresh to get updated state if needed elsewhere
 
-# Added function to clear the hash on logout
-def clear_refresh_token(*, session: Session, user: User) -> None:
-    """Clears the user's hashed refresh token in the database."""
-    user.refresh_token = None
-    session.add(user)
+def _save_user(session: Session, db_user: User) -> None:
+    session.add(db_user)
     session.commit()
-
@@ -52,3 +52,21 @@ export const getMostReviewedBooks = (limit = 10) =>
 
 export const getBookById = (id) =>
   baseQuery({ url: `/books/${id}`, method: 'get' });
+
+/**
+ * Get the homepage lists (on_sale, recommended, popular) in one response.
+ * Components mounted together share the request in flight; later calls are
+ * served from the HTTP cache while the response is fresh.
+ *
+ * @returns {Promise<Object>} - { on_sale, recommended, popular }, each a book list response
+ */
+let homeRequest = null;
+
+export const getHome = () => {
+  if (!homeRequest) {
+    homeRequest = baseQuery({ url: '/home', method: 'get' }).finally(() => {
+      homeRequest = null;
+    });
+  }
+  return homeRequest;
+};
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from "react";
 import BookCard from "./BookCard";
-import { getRecommendedBooks, getMostReviewedBooks } from "../api/books";
+import { getHome } from "../api/books";
 
 export default function Feature() {
     const [books, setBooks] = useState([]);
@@ -14,12 +14,9 @@ export default function Feature() {
                 setLoading(true);
                 setError(null);
                 
-                let data;
-                if (activeTab === 'recommended') {
-                    data = await getRecommendedBooks(8);  // Fetch 8 recommended books
-                } else {
-                    data = await getMostReviewedBooks(8);  // Fetch 8 most reviewed books
-                }
+                // Both tabs come from /home (8 recommended, 8 popular books)
+                const home = await getHome();
+                const data = activeTab === 'recommended' ? home?.recommended : home?.popular;
                 
                 if (data && data.books) {
                     setBooks(data.books);
@@ -9,7 +9,7 @@ import {
 import useEmblaCarousel from "embla-carousel-react"
 import BookCard from "./BookCard"
 import { ChevronRight } from "lucide-react"
-import { getBooksOnSale } from "../api/books"
+import { getHome } from "../api/books"
 import { Link } from "react-router-dom"
 export default function Onsale() {
     const [emblaRef, emblaApi] = useEmblaCarousel({
@@ -26,7 +26,7 @@ export default function Onsale() {
         const fetchBooks = async () => {
             try {
                 setLoading(true);
-                const data = await getBooksOnSale(10);
+                const data = (await getHome())?.on_sale;
                 if (data && data.books) {
                     setBooks(data.books);
                     console.log(data);